@@ -1,5 +1,62 @@
-import time
-from core.ui_utils import UIUtils
+import shlex
+from actions.image_recognition import invalidate_frame_cache
+
+class InputSequence:
+    """
+    Sequência de inputs (taps, keyevents, texto, swipes e pausas) executada
+    num único round-trip do shell. Cada 'input' do Android sobe um processo
+    próprio, então keyevents repetidos vão juntos num só 'input keyevent'.
+    Uso: click.sequence().tap(640, 330).delay(1).keyevent(67, repeat=30).run()
+    """
+
+    def __init__(self, click_actions):
+        self._click = click_actions
+        self._commands = []
+        self._delay = 0.0
+
+    def tap(self, x, y, normalize=True):
+        if normalize:
+            x, y = self._click.utils.normalize(x, y)
+        self._commands.append(f"input tap {x} {y}")
+        return self
+
+    def swipe(self, x1, y1, x2, y2, duration_ms=500, normalize=True):
+        if normalize:
+            x1, y1 = self._click.utils.normalize(x1, y1)
+            x2, y2 = self._click.utils.normalize(x2, y2)
+        self._commands.append(f"input swipe {x1} {y1} {x2} {y2} {duration_ms}")
+        return self
+
+    def long_press(self, x, y, duration_ms=1500, normalize=True):
+        if normalize:
+            x, y = self._click.utils.normalize(x, y)
+        return self.swipe(x, y, x, y, duration_ms, normalize=False)
+
+    def keyevent(self, keycode, repeat=1):
+        self._commands.append("input keyevent " + " ".join([str(keycode)] * repeat))
+        return self
+
+    def text(self, text):
+        """Digita o texto no campo em foco (espaços viram %s, como o 'input text' exige)."""
+        self._commands.append(f"input text {shlex.quote(text.replace(' ', '%s'))}")
+        return self
+
+    def delay(self, seconds):
+        self._commands.append(f"sleep {seconds}")
+        self._delay += seconds
+        return self
+
+    def run(self):
+        """Executa a sequência inteira num só comando de shell."""
+        if not self._commands:
+            return None
+        click = self._click
+        click.log.info(f"Executando sequência de {len(self._commands)} comando(s) de input em um round-trip")
+        result = click.emu.shell("; ".join(self._commands), timeout=30 + self._delay)
+        invalidate_frame_cache(click.instance_id)
+        self._commands = []
+        self._delay = 0.0
+        return result
 
 class ClickActions:
     def __init__(self, emulator_manager, instance_id=0, base_res=(1280, 720)):
@@ -11,29 +68,42 @@ class ClickActions:
         self.instance_id = instance_id
         self.log = emulator_manager.log
         
-        # Detecta resolução real para normalização
+        self.base_res = tuple(base_res)
+        
+        # Resolução real e escala vêm do cache do EmulatorManager (um 'wm size' por instância)
         curr_w, curr_h = self.emu.get_screen_resolution()
-        self.utils = UIUtils(current_width=curr_w, current_height=curr_h, 
-                             base_width=base_res[0], base_height=base_res[1])
         
         self.log.info(f"ClickActions configurado: Escala base {base_res} -> Real {curr_w}x{curr_h}")
 
+    @property
+    def utils(self):
+        """
+        Escala atual da instância. Consultada a cada uso (não guardada aqui) para
+        acompanhar o reset do cache no start/stop e leituras feitas antes do boot.
+        """
+        return self.emu.get_ui_utils(self.base_res)
+
     def tap(self, x, y, normalize=True):
         """Executa um clique simples (tap)."""
         if normalize:
             x, y = self.utils.normalize(x, y)
         
         self.log.info(f"Executando TAP em ({x}, {y})")
-        return self.emu._execute_memuc([
+        result = self.emu._execute_memuc([
             'adb', '-i', str(self.instance_id), 
             'shell', 'input', 'tap', str(x), str(y)
         ])
+        # A tela mudou (ou vai mudar): o próximo find_element precisa de print novo
+        invalidate_frame_cache(self.instance_id)
+        return result
+
+    def sequence(self):
+        """Cria uma sequência de inputs executada num único round-trip (ver InputSequence)."""
+        return InputSequence(self)
 
     def double_tap(self, x, y, interval=0.2, normalize=True):
         """Executa dois cliques rápidos no mesmo local."""
-        self.tap(x, y, normalize)
-        time.sleep(interval)
-        return self.tap(x, y, normalize)
+        return self.sequence().tap(x, y, normalize).delay(interval).tap(x, y, normalize).run()
 
     def long_press(self, x, y, duration_ms=1500, normalize=True):
         """
@@ -44,11 +114,13 @@ class ClickActions:
             x, y = self.utils.normalize(x, y)
             
         self.log.info(f"Executando LONG PRESS em ({x}, {y}) por {duration_ms}ms")
-        return self.emu._execute_memuc([
+        result = self.emu._execute_memuc([
             'adb', '-i', str(self.instance_id), 
             'shell', 'input', 'swipe', 
             str(x), str(y), str(x), str(y), str(duration_ms)
         ])
+        invalidate_frame_cache(self.instance_id)
+        return result
 
     def swipe(self, x1, y1, x2, y2, duration_ms=500, normalize=True):
         """Executa um deslize (swipe) entre dois pontos."""
@@ -56,8 +128,10 @@ class ClickActions:
             x1, y1 = self.utils.normalize(x1, y1)
             x2, y2 = self.utils.normalize(x2, y2)
             
-        return self.emu._execute_memuc([
+        result = self.emu._execute_memuc([
             'adb', '-i', str(self.instance_id), 
             'shell', 'input', 'swipe', 
             str(x1), str(y1), str(x2), str(y2), str(duration_ms)
-        ])
\ No newline at end of file
+        ])
+        invalidate_frame_cache(self.instance_id)
+        return result
\ No newline at end of file
@@ -1,22 +1,25 @@
 import time
+from core.instance_context import InstanceContext
+from actions.wait_conditions import wait_until, ElementAppears, ScreenChanged, ScreenStable, Then
 
 class DailyBonus:
     """
     Gerencia o bônus diário e giros de roleta para ganho de fichas iniciais.
     """
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
         self.vision = None # Inicializado via Lazy Loading
-        self.log = emulator_manager.log
+        self.click = None
+        self.log = self.ctx.log
 
     def check_and_spin(self):
         """
         Detecta se a roleta está na tela e realiza o giro.
         """
-        from actions.image_recognition import ImageRecognition
         if not self.vision:
-            self.vision = ImageRecognition(self.emu, self.instance_id)
+            self.vision = self.ctx.vision
 
         self.log.info(f"[*] Verificando presença de Roleta Diária na Instância {self.instance_id}...")
 
@@ -27,13 +30,18 @@ class DailyBonus:
         if pos_spin:
             self.log.info("[+] Roleta detectada! Girando...")
             # Clica no centro da roleta
-            from actions.click_actions import ClickActions
-            ca = ClickActions(self.emu, self.instance_id)
-            ca.tap(pos_spin[0], pos_spin[1], normalize=False)
+            if not self.click:
+                self.click = self.ctx.click
+            self.click.tap(pos_spin[0], pos_spin[1], normalize=False)
             
-            # 2. Aguarda a animação da roleta parar (geralmente 5 a 8 segundos)
+            # 2. Aguarda a animação da roleta parar (geralmente 5 a 8 segundos):
+            #    sai assim que o botão de coletar surge ou a tela para de girar
             self.log.info("[*] Aguardando sorteio das fichas...")
-            time.sleep(10)
+            wait_until(
+                ElementAppears(self.vision, "ui/coletar_roleta.png", threshold=0.7)
+                | Then(ScreenChanged(self.vision), ScreenStable(self.vision, stable_for=2)),
+                timeout=10
+            )
 
             # 3. Tenta coletar o prêmio
             pos_collect = self.vision.find_element("ui/coletar_roleta.png", threshold=0.7, click=True)
@@ -0,0 +1,121 @@
+import cv2
+import numpy as np
+import os
+from collections.abc import Mapping
+from core.instance_context import InstanceContext
+
+class DigitReader:
+    """
+    Leitor numérico rápido para regiões como ui_regions.chips_amount.
+    Usa glifos de dígitos (assets/digits/0.png ... 9.png) quando existirem;
+    caso contrário, OCR restrito a dígitos pelo motor compartilhado (com cache).
+    Sempre trabalha sobre o frame já capturado.
+    """
+
+    GLYPH_SIZE = (16, 24) # (largura, altura) de normalização dos glifos
+
+    def __init__(self, emulator_manager, instance_id=0, glyph_dir="assets/digits", min_score=0.6):
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
+        self.log = self.ctx.log
+        self.min_score = min_score
+        self.glyphs = self._load_glyphs(glyph_dir)
+
+    def _load_glyphs(self, glyph_dir):
+        glyphs = {}
+        for digit in range(10):
+            for ext in ('.png', '.PNG'):
+                path = os.path.join(glyph_dir, f"{digit}{ext}")
+                if os.path.exists(path):
+                    img = cv2.imread(path)
+                    if img is not None:
+                        glyphs[str(digit)] = self._normalize(self._binarize(img))
+                    break
+        return glyphs if len(glyphs) == 10 else {}
+
+    def is_fast(self):
+        """Leitura barata o bastante para cada giro: glifos carregados ou OCR persistente (tesserocr)."""
+        return bool(self.glyphs) or self.ctx.ocr.engine.warm_up()
+
+    def _binarize(self, crop_img):
+        """Cinza + Otsu, com o texto sempre branco sobre fundo preto."""
+        gray = cv2.cvtColor(crop_img, cv2.COLOR_BGR2GRAY) if crop_img.ndim == 3 else crop_img
+        binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        if cv2.countNonZero(binary) > binary.size / 2:
+            binary = cv2.bitwise_not(binary)
+        return binary
+
+    def _normalize(self, binary):
+        """Recorta o glifo no seu contorno e redimensiona para o tamanho padrão."""
+        points = cv2.findNonZero(binary)
+        if points is None:
+            return np.zeros(self.GLYPH_SIZE[::-1], dtype=np.uint8)
+        x, y, w, h = cv2.boundingRect(points)
+        return cv2.resize(binary[y:y+h, x:x+w], self.GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+
+    def _resolve_region(self, region):
+        if isinstance(region, str):
+            region = self.emu.config.timings.get("ui_regions", {}).get(region)
+        if isinstance(region, Mapping):
+            region = (region['x'], region['y'], region['w'], region['h'])
+        return region
+
+    def read_int(self, region, frame=None):
+        """
+        Lê o número de uma região.
+        :param region: Nome em ui_regions, dict {'x','y','w','h'} ou tupla (x, y, w, h).
+        :param frame: Frame já capturado (opcional).
+        :return: int ou None se nada legível.
+        """
+        reg = self._resolve_region(region)
+        if not reg:
+            self.log.error(f"Região numérica {region} não definida no timings.json")
+            return None
+
+        img = frame if frame is not None else self.ctx.vision.capture_frame()
+        if img is None:
+            return None
+
+        x, y, w, h = reg
+        crop = img[y:y+h, x:x+w]
+        if crop.size == 0:
+            return None
+
+        if self.glyphs:
+            value = self._read_glyphs(crop)
+            if value is not None:
+                return value
+
+        text = self.ctx.ocr.read_text(crop, psm=7, whitelist="0123456789")
+        digits = ''.join(filter(str.isdigit, text))
+        return int(digits) if digits else None
+
+    def _read_glyphs(self, crop):
+        """Segmenta os dígitos por componentes conexos e compara com os glifos."""
+        binary = self._binarize(crop)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        blobs = [stats[i] for i in range(1, count)]
+        if not blobs:
+            return None
+
+        # Separadores de milhar (pontos/vírgulas) são bem mais baixos que os dígitos
+        max_h = max(b[cv2.CC_STAT_HEIGHT] for b in blobs)
+        blobs = sorted((b for b in blobs if b[cv2.CC_STAT_HEIGHT] >= max_h * 0.6), key=lambda b: b[cv2.CC_STAT_LEFT])
+
+        digits = []
+        for b in blobs:
+            bx, by, bw, bh = b[cv2.CC_STAT_LEFT], b[cv2.CC_STAT_TOP], b[cv2.CC_STAT_WIDTH], b[cv2.CC_STAT_HEIGHT]
+            glyph = cv2.resize(binary[by:by+bh, bx:bx+bw], self.GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+
+            best_digit, best_score = None, -1.0
+            for digit, template in self.glyphs.items():
+                score = cv2.matchTemplate(glyph, template, cv2.TM_CCOEFF_NORMED)[0][0]
+                if score > best_score:
+                    best_digit, best_score = digit, score
+
+            if best_score < self.min_score:
+                return None # Glifo desconhecido: deixa o OCR decidir
+            digits.append(best_digit)
+
+        return int(''.join(digits)) if digits else None
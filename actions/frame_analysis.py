@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+# Tamanho da miniatura usada para comparar frames (barata e tolerante a ruído)
+SIGNATURE_SIZE = (64, 36)
+# Diferença (0 a 255) numa célula da miniatura que já conta como mudança local.
+# Um botão pequeno colado na tela muda alguma célula em 25+; ruído fica em 1-2.
+CELL_TOLERANCE = 8
+
+def frame_signature(frame):
+    """Reduz um frame (BGR ou cinza) a uma miniatura em cinza para comparação rápida."""
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(frame, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    return small.astype(np.int16)
+
+def frame_difference(sig_a, sig_b):
+    """Diferença média absoluta (0 a 255) entre duas assinaturas."""
+    if sig_a is None or sig_b is None or sig_a.shape != sig_b.shape:
+        return 255.0
+    return float(np.mean(np.abs(sig_a - sig_b)))
+
+def frames_differ(sig_a, sig_b, tolerance=2.0):
+    """True se as assinaturas diferem mais que a tolerância."""
+    return frame_difference(sig_a, sig_b) > tolerance
+
+def frames_differ_locally(sig_a, sig_b, cell_tolerance=CELL_TOLERANCE):
+    """
+    True se alguma célula da miniatura mudou mais que a tolerância.
+    Ao contrário da média do frame inteiro, detecta mudanças pequenas
+    (um botão ou diálogo que apareceu).
+    """
+    if sig_a is None or sig_b is None or sig_a.shape != sig_b.shape:
+        return True
+    return int(np.max(np.abs(sig_a - sig_b))) > cell_tolerance
+
+def perceptual_hash(frame, hash_size=16):
+    """
+    Hash perceptual (dHash) do frame: compara o brilho de pixels vizinhos numa
+    miniatura, então pequenas animações mudam poucos bits.
+    :return: Inteiro com hash_size * hash_size bits.
+    """
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(frame, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+def hamming_distance(hash_a, hash_b):
+    """Quantidade de bits diferentes entre dois hashes."""
+    return bin(hash_a ^ hash_b).count('1')
@@ -1,7 +1,54 @@
 import cv2
 import numpy as np
 import os
+import threading
 import time
+from collections.abc import Mapping
+from actions.template_library import TemplateLibrary
+from actions.pyramid_matching import match_full, match_pyramid
+from actions.frame_analysis import frame_signature, frames_differ_locally
+
+class _VisionState:
+    """
+    Estado de visão de uma instância, compartilhado por todas as
+    ImageRecognition dela: último frame capturado e última posição
+    (canto superior esquerdo) em que cada template foi encontrado.
+    A geração é incrementada a cada invalidação para descartar capturas
+    que começaram antes de um tap.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frame = None
+        self.gray = None
+        self.frame_time = 0.0
+        self.generation = 0
+        self.last_locations = {}
+        # Frame visto antes do último input e o horário desse input
+        self.input_reference = None
+        self.input_time = 0.0
+
+_VISION_STATES = {}
+_VISION_STATES_LOCK = threading.Lock()
+
+def _get_vision_state(instance_id):
+    with _VISION_STATES_LOCK:
+        state = _VISION_STATES.get(str(instance_id))
+        if state is None:
+            state = _VisionState()
+            _VISION_STATES[str(instance_id)] = state
+        return state
+
+def invalidate_frame_cache(instance_id):
+    """Descarta o frame em cache da instância (chamado após tap/swipe)."""
+    cache = _get_vision_state(instance_id)
+    with cache.lock:
+        # Guarda a tela de antes do input para as condições de 'tela mudou'
+        if cache.frame is not None:
+            cache.input_reference = cache.frame
+        cache.input_time = time.time()
+        cache.frame = None
+        cache.gray = None
+        cache.generation += 1
 
 class ImageRecognition:
     """
@@ -28,6 +75,90 @@ class ImageRecognition:
             if not os.path.exists(directory):
                 os.makedirs(directory)
 
+        # Modo de captura: 'stream' (framebuffer em memória) ou 'file' (screencap -p + pull)
+        vision_cfg = self.emu.config.settings.get('vision', {}) or {}
+        self.capture_mode = vision_cfg.get('capture_mode', 'stream')
+        # Tempo (s) em que buscas consecutivas reaproveitam o mesmo print
+        self.frame_ttl = vision_cfg.get('frame_cache_ttl', 0.5)
+        # Margem (px) da janela de busca ao redor da última posição conhecida
+        self.hint_margin = vision_cfg.get('hint_margin', 40)
+        # Varreduras completas: 'full' (resolução cheia) ou 'pyramid' (grosso-para-fino)
+        self.match_mode = vision_cfg.get('match_mode', 'pyramid')
+        # Polling adaptativo do wait_for_element
+        self.adaptive_polling = vision_cfg.get('adaptive_polling', True)
+        self.min_poll_interval = vision_cfg.get('min_poll_interval', 0.25)
+        self._state = _get_vision_state(self.instance_id)
+        self.templates = TemplateLibrary.shared()
+
+    def capture_frame(self, use_cache=True):
+        """
+        Retorna a tela atual como array BGR (NumPy), somente leitura.
+        Reaproveita o frame em cache se ele tiver menos de frame_ttl segundos.
+        """
+        cache = self._state
+        with cache.lock:
+            generation = cache.generation
+            if use_cache and cache.frame is not None and time.time() - cache.frame_time <= self.frame_ttl:
+                return cache.frame
+
+        frame = self._grab_frame()
+        if frame is None:
+            return None
+
+        frame.flags.writeable = False
+        with cache.lock:
+            # Um tap durante a captura torna este frame obsoleto: não guarda
+            if cache.generation == generation:
+                cache.frame = frame
+                cache.gray = None
+                cache.frame_time = time.time()
+        return frame
+
+    def invalidate_frame_cache(self):
+        invalidate_frame_cache(self.instance_id)
+
+    def latest_frame(self):
+        """Retorna (último frame capturado, horário da captura) sem capturar de novo."""
+        with self._state.lock:
+            return self._state.frame, self._state.frame_time
+
+    def input_reference(self):
+        """Retorna (frame anterior ao último tap/swipe, horário do input)."""
+        with self._state.lock:
+            return self._state.input_reference, self._state.input_time
+
+    def _grab_frame(self):
+        """
+        Captura um frame novo (sem cache).
+        Tenta o caminho em memória e cai para o print em arquivo se falhar.
+        """
+        if self.capture_mode == 'stream':
+            frame = self._capture_stream()
+            if frame is not None:
+                return frame
+            self.log.warning(f"Captura em memória falhou na instância {self.instance_id}. Usando arquivo.")
+
+        screen_path = self._take_screenshot()
+        return cv2.imread(screen_path)
+
+    def _capture_stream(self):
+        """Converte o framebuffer cru do screencap (RGBA_8888) em array BGR."""
+        raw = self.emu.capture_raw_screen()
+        if not raw or len(raw) < 12:
+            return None
+
+        width, height, _pixel_format = np.frombuffer(raw, dtype='<u4', count=3)
+        width, height = int(width), int(height)
+        pixels_size = width * height * 4
+        # O cabeçalho tem 12 bytes (Android <= 8) ou 16 bytes (com colorspace)
+        header_size = len(raw) - pixels_size
+        if width <= 0 or height <= 0 or header_size not in (12, 16):
+            self.log.error(f"Framebuffer inesperado ({width}x{height}, {len(raw)} bytes).")
+            return None
+
+        rgba = np.frombuffer(raw, dtype=np.uint8, offset=header_size).reshape((height, width, 4))
+        return cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
+
     def _take_screenshot(self, custom_path=None):
         """Captura a tela com verificação de integridade."""
         save_path = custom_path if custom_path else os.path.join(self.temp_dir, f"screen_{self.instance_id}.png")
@@ -58,71 +189,212 @@ class ImageRecognition:
         self._take_screenshot(custom_path=path)
         self.log.critical(f"📸 Screenshot de erro gerado: {path}")
 
-    def find_element(self, template_name, threshold=0.8, click=False):
+    def capture_gray(self, use_cache=True):
+        """Versão em escala de cinza do frame atual (convertida uma vez por frame)."""
+        frame = self.capture_frame(use_cache=use_cache)
+        if frame is None:
+            return None
+
+        cache = self._state
+        with cache.lock:
+            if cache.frame is frame and cache.gray is not None:
+                return cache.gray
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray.flags.writeable = False
+        with cache.lock:
+            if cache.frame is frame:
+                cache.gray = gray
+        return gray
+
+    def _load_template(self, template_name):
+        """Template em escala de cinza da biblioteca compartilhada (ou None se ausente)."""
+        template_gray = self.templates.get(template_name)
+        if template_gray is None:
+            self.templates.report_once(template_name, self.log)
+        return template_gray
+
+    def _match_in(self, img_gray, template_gray, x0, y0, x1, y1, coarse=False):
+        """
+        Matching restrito ao retângulo [x0:x1, y0:y1]; devolve coordenadas do frame.
+        :param coarse: Se True e match_mode == 'pyramid', usa o matching grosso-para-fino.
+        :return: Tupla (confiança, (x, y) do canto superior esquerdo) ou (-1.0, None).
+        """
+        h, w = template_gray.shape[:2]
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(img_gray.shape[1], x1), min(img_gray.shape[0], y1)
+        if x1 - x0 < w or y1 - y0 < h:
+            return -1.0, None
+
+        matcher = match_pyramid if coarse and self.match_mode == 'pyramid' else match_full
+        max_val, loc = matcher(img_gray[y0:y1, x0:x1], template_gray)
+        return max_val, (loc[0] + x0, loc[1] + y0)
+
+    def _locate(self, img_gray, template_name, template_gray, threshold, region=None):
+        """
+        Localiza o template: primeiro numa janela ao redor da última posição
+        conhecida, depois na região pedida (ou no frame inteiro).
+        :param region: (x, y, w, h) ou dict {'x','y','w','h'} em pixels reais.
+        :return: Tupla (confiança, (centro_x, centro_y)).
+        """
+        h, w = template_gray.shape[:2]
+
+        # Limites da busca: região pedida ou frame inteiro
+        if region:
+            if isinstance(region, Mapping):
+                region = (region['x'], region['y'], region['w'], region['h'])
+            rx, ry, rw, rh = region
+            bounds = (rx, ry, rx + rw, ry + rh)
+        else:
+            bounds = (0, 0, img_gray.shape[1], img_gray.shape[0])
+
+        with self._state.lock:
+            hint = self._state.last_locations.get(template_name)
+
+        max_val, loc = -1.0, None
+        if hint:
+            m = self.hint_margin
+            max_val, loc = self._match_in(
+                img_gray, template_gray,
+                max(bounds[0], hint[0] - m), max(bounds[1], hint[1] - m),
+                min(bounds[2], hint[0] + w + m), min(bounds[3], hint[1] + h + m)
+            )
+
+        # Miss na janela da dica: varredura completa da área
+        if max_val < threshold:
+            max_val, loc = self._match_in(img_gray, template_gray, *bounds, coarse=True)
+
+        if loc is None:
+            return max_val, None
+
+        if max_val >= threshold:
+            with self._state.lock:
+                self._state.last_locations[template_name] = loc
+        return max_val, (loc[0] + w // 2, loc[1] + h // 2)
+
+    def _tap(self, x, y):
+        # Usa o ClickActions único da instância (InstanceContext)
+        from core.instance_context import InstanceContext
+        InstanceContext.of(self.emu, self.instance_id).click.tap(x, y, normalize=False) # Coordenada já é real
+
+    def find_element(self, template_name, threshold=0.8, click=False, region=None):
         """
         Executa a busca por um padrão de imagem (template) na tela atual.
         
         :param template_name: Nome da imagem em assets/buttons/.
         :param threshold: Nível de confiança (0.0 a 1.0).
         :param click: Se True, executa o TAP no centro do elemento encontrado.
+        :param region: Área opcional de busca (x, y, w, h) em pixels reais.
         :return: Tupla (x, y) das coordenadas reais ou None.
         """
-        template_path = os.path.join("assets/buttons", template_name)
-        
-        if not os.path.exists(template_path):
-            self.log.error(f"Arquivo de template ausente: {template_path}")
+        template_gray = self._load_template(template_name)
+        if template_gray is None:
             return None
 
-        # Processamento de Imagem
-        screen_path = self._take_screenshot()
-        img_rgb = cv2.imread(screen_path)
-        template = cv2.imread(template_path)
-        
-        # Conversão para escala de cinza (otimização de performance)
-        img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-        w, h = template_gray.shape[::-1]
+        # Processamento de Imagem (escala de cinza = otimização de performance)
+        img_gray = self.capture_gray()
+        if img_gray is None:
+            self.log.error(f"Falha ao capturar a tela da instância {self.instance_id}.")
+            return None
 
-        # Template Matching
-        res = cv2.matchTemplate(img_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        max_val, center = self._locate(img_gray, template_name, template_gray, threshold, region)
 
         if max_val >= threshold:
-            center_x = max_loc[0] + w // 2
-            center_y = max_loc[1] + h // 2
-            
             self.log.info(f"Elemento '{template_name}' localizado (Confiança: {max_val:.2f})")
             
             if click:
-                from actions.click_actions import ClickActions
-                ca = ClickActions(self.emu, self.instance_id)
-                ca.tap(center_x, center_y, normalize=False) # Coordenada já é real
+                self._tap(*center)
                 
-            return (center_x, center_y)
+            return center
         
         return None
 
-    def wait_for_element(self, template_name, timeout=30, interval=2, threshold=0.8, click_on_find=False):
+    def find_any(self, template_names, threshold=0.8, click=False):
+        """
+        Procura uma lista de templates em um único frame.
+        
+        :param template_names: Lista de nomes de imagens em assets/buttons/.
+        :param threshold: Nível de confiança mínimo (0.0 a 1.0).
+        :param click: Se True, executa o TAP no resultado de maior confiança.
+        :return: Lista de tuplas (nome, (x, y), confiança), da maior para a menor confiança.
+        """
+        img_gray = self.capture_gray()
+        if img_gray is None:
+            self.log.error(f"Falha ao capturar a tela da instância {self.instance_id}.")
+            return []
+
+        matches = []
+        for template_name in template_names:
+            template_gray = self._load_template(template_name)
+            if template_gray is None:
+                continue
+
+            max_val, center = self._locate(img_gray, template_name, template_gray, threshold)
+            if max_val >= threshold:
+                matches.append((template_name, center, max_val))
+
+        matches.sort(key=lambda m: m[2], reverse=True)
+
+        if matches:
+            best_name, best_center, best_val = matches[0]
+            self.log.info(f"Elemento '{best_name}' localizado (Confiança: {best_val:.2f}, {len(matches)} candidato(s))")
+            if click:
+                self._tap(*best_center)
+
+        return matches
+
+    def wait_for_element(self, template_name, timeout=30, interval=2, threshold=0.8, click_on_find=False, region=None, adaptive=None):
         """
         Pausa o fluxo de trabalho até que a condição visual seja satisfeita.
         Implementa fallback de erro com salvamento de imagem.
+        :param region: Área opcional de busca (x, y, w, h) em pixels reais.
+        :param adaptive: Polling adaptativo (padrão: vision.adaptive_polling). Checa
+                         rápido logo após um input ou quando a tela muda, recua até
+                         'interval' com a tela parada e pula o matching se o frame
+                         é igual ao do último resultado negativo.
         """
+        if adaptive is None:
+            adaptive = self.adaptive_polling
         self.log.info(f"[*] Aguardando visual de '{template_name}' (Limite: {timeout}s)")
         
         start_time = time.time()
+        delay = self.min_poll_interval
+        negative_sig = None
+        last_match = 0.0
         while time.time() - start_time < timeout:
-            pos = self.find_element(template_name, threshold=threshold)
+            if adaptive:
+                frame = self.capture_frame(use_cache=False)
+                sig = frame_signature(frame) if frame is not None else None
+                # Mesma tela do último negativo (nenhuma célula mudou): o template
+                # continua ausente. Ainda assim faz um matching a cada 'interval'.
+                if (sig is not None and negative_sig is not None
+                        and not frames_differ_locally(sig, negative_sig)
+                        and time.time() - last_match < interval):
+                    delay = min(delay * 2, interval)
+                    time.sleep(max(0, min(delay, timeout - (time.time() - start_time))))
+                    continue
+
+            last_match = time.time()
+            pos = self.find_element(template_name, threshold=threshold, region=region)
             
             if pos:
                 if click_on_find:
-                    from actions.click_actions import ClickActions
-                    ca = ClickActions(self.emu, self.instance_id)
-                    ca.tap(pos[0], pos[1], normalize=False)
+                    self._tap(pos[0], pos[1])
                 return pos
-            
-            time.sleep(interval)
+
+            if not adaptive:
+                time.sleep(interval)
+                continue
+
+            # Tela mudando (ou logo após um tap): checa rápido; senão recua
+            _, input_time = self.input_reference()
+            screen_changed = negative_sig is not None and frames_differ_locally(sig, negative_sig)
+            screen_moving = screen_changed or time.time() - input_time < 2 * interval
+            delay = self.min_poll_interval if screen_moving else min(delay * 2, interval)
+            negative_sig = sig
+            time.sleep(max(0, min(delay, timeout - (time.time() - start_time))))
             
         # Tratamento de Timeout
         self.log.error(f"[!] Falha: '{template_name}' não encontrado no tempo estipulado.")
         self._save_error_snapshot(template_name.split('.')[0])
-        return None
\ No newline at end of file
+        return None
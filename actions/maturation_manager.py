@@ -1,5 +1,6 @@
 import time
 import random
+from core.instance_context import InstanceContext
 
 class MaturationManager:
     """
@@ -7,21 +8,19 @@ class MaturationManager:
     e evitar detecção de bots de criação em massa.
     """
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
         self.vision = None
         self.click = None
-        self.log = emulator_manager.log
+        self.log = self.ctx.log
         # Carrega configurações do settings.yaml
         self.config = getattr(self.emu, 'settings', {})
 
     def _ensure_tools(self):
         """Garante que as ferramentas de visão e clique estejam inicializadas."""
-        from actions.image_recognition import ImageRecognition
-        from actions.click_actions import ClickActions
-        
-        if not self.vision: self.vision = ImageRecognition(self.emu, self.instance_id)
-        if not self.click: self.click = ClickActions(self.emu, self.instance_id)
+        if not self.vision: self.vision = self.ctx.vision
+        if not self.click: self.click = self.ctx.click
 
     def quick_table_exit(self):
         """
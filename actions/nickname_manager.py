@@ -1,7 +1,7 @@
 import time
 import os
 from core.name_generator import NameGenerator
-from actions.click_actions import ClickActions
+from core.instance_context import InstanceContext
 
 class NicknameManager:
     """
@@ -9,14 +9,13 @@ class NicknameManager:
     confirmação de pop-ups e tratamento de erro de '15 dias'.
     """
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
-        self.log = emulator_manager.log
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
+        self.log = self.ctx.log
         self.name_gen = NameGenerator()
-        self.click = ClickActions(self.emu, self.instance_id)
-        
-        from actions.image_recognition import ImageRecognition
-        self.vision = ImageRecognition(self.emu, self.instance_id)
+        self.click = self.ctx.click
+        self.vision = self.ctx.vision
 
     def change_nickname(self):
         """Fluxo completo com tratamento de erro de nome já alterado."""
@@ -41,21 +40,17 @@ class NicknameManager:
         
         time.sleep(2)
 
-        # 3. Limpeza do campo e Digitação
-        self.emu._execute_memuc(['adb', '-i', str(self.instance_id), 'shell', 'input', 'tap', '640', '330'])
-        time.sleep(1)
-        
-        # Limpeza agressiva
-        for _ in range(30):
-            self.emu._execute_memuc(['adb', '-i', str(self.instance_id), 'shell', 'input', 'keyevent', '67'])
-        
+        # 3. Limpeza do campo e Digitação (um único round-trip de shell)
         novo_nome = self.name_gen.generate_human_like()
-        nome_adb = "".join(c for c in novo_nome if c.isalnum() or c == ' ').replace(" ", "%s")
-        
+        nome_adb = "".join(c for c in novo_nome if c.isalnum() or c == ' ')
+
         self.log.info(f"[+] Digitando novo nome: {novo_nome}")
-        self.emu._execute_memuc(['adb', '-i', str(self.instance_id), 'shell', 'input', 'text', nome_adb])
-        time.sleep(1)
-        self.emu._execute_memuc(['adb', '-i', str(self.instance_id), 'shell', 'input', 'keyevent', '66']) # Enter
+        (self.click.sequence()
+            .tap(640, 330, normalize=False).delay(1)
+            .keyevent(67, repeat=30) # Limpeza agressiva
+            .text(nome_adb).delay(1)
+            .keyevent(66) # Enter
+            .run())
         time.sleep(2)
 
         # 4. Confirmar na Interface
@@ -1,16 +1,168 @@
 import cv2
+import hashlib
 import pytesseract
 import numpy as np
 import os
+import queue
+import threading
+from collections import OrderedDict
+from core.instance_context import InstanceContext
+
+try:
+    # Motor persistente (libtesseract carregada no processo); opcional
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+class TesseractEngine:
+    """
+    Motor OCR único por processo.
+    Com o tesserocr instalado, mantém um pool de APIs do Tesseract carregadas
+    (uma por instância em uso, até pool_size); sem ele, usa o pytesseract.
+    Os resultados são memorizados pelo hash da imagem pré-processada.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, settings=None):
+        """Retorna o motor global, criado com as configurações da seção 'ocr'."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                settings = settings or {}
+                cfg = settings.get('ocr', {}) or {}
+                cls._shared = cls(
+                    pool_size=cfg.get('pool_size') or settings.get('emulator', {}).get('instances_limit', 4),
+                    cache_size=cfg.get('cache_size', 512),
+                    tessdata_path=cfg.get('tessdata_path'),
+                    tesseract_cmd=cfg.get('tesseract_cmd', r'C:\Program Files\Tesseract-OCR\tesseract.exe'),
+                    acquire_timeout=cfg.get('acquire_timeout', 5),
+                )
+                if tesserocr is None:
+                    print("[!] tesserocr não instalado: OCR via pytesseract (um processo do Tesseract por leitura). "
+                          "Instale com 'pip install -r requirements-ocr.txt'.")
+            return cls._shared
+
+    def __init__(self, pool_size=4, cache_size=512, tessdata_path=None, tesseract_cmd=None, acquire_timeout=5):
+        self.pool_size = max(1, int(pool_size))
+        self.cache_size = cache_size
+        self.tessdata_path = tessdata_path
+        self.acquire_timeout = acquire_timeout
+        # Desligado se o tesserocr faltar ou não conseguir carregar o Tesseract
+        self.persistent = tesserocr is not None
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+        self._apis = queue.Queue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def recognize(self, image, psm=7, whitelist=None):
+        """
+        Executa OCR numa imagem já pré-processada (cinza/binária).
+        :param psm: Page Segmentation Mode do Tesseract (7 = uma linha).
+        :param whitelist: Caracteres permitidos (ex: '0123456789').
+        """
+        image = np.ascontiguousarray(image)
+        key = hashlib.blake2b(
+            image.tobytes() + f"{image.shape}|{psm}|{whitelist}".encode(), digest_size=16
+        ).hexdigest()
+
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        text = self._recognize_persistent(image, psm, whitelist) if self.persistent else None
+        if text is None:
+            config = f'--oem 3 --psm {psm}'
+            if whitelist:
+                config += f' -c tessedit_char_whitelist={whitelist}'
+            text = pytesseract.image_to_string(image, config=config)
+        text = text.strip()
+
+        with self._cache_lock:
+            self._cache[key] = text
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def warm_up(self):
+        """
+        Carrega uma API do pool já na inicialização.
+        :return: True se o motor persistente (tesserocr) está ativo.
+        """
+        if self.persistent:
+            api = self._acquire_api()
+            if api is not None:
+                self._apis.put(api)
+        return self.persistent
+
+    def _recognize_persistent(self, image, psm, whitelist):
+        """OCR por uma API do pool; None se não houver API disponível."""
+        api = self._acquire_api()
+        if api is None:
+            return None
+        try:
+            api.SetPageSegMode(psm)
+            api.SetVariable("tessedit_char_whitelist", whitelist or "")
+            height, width = image.shape[:2]
+            bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+            api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+            return api.GetUTF8Text()
+        finally:
+            self._apis.put(api)
+
+    def _acquire_api(self):
+        """
+        Pega uma API livre do pool; cria outra se o pool ainda não encheu.
+        :return: API ou None (falha ao carregar o Tesseract ou pool ocupado além do timeout).
+        """
+        try:
+            return self._apis.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if self._created < self.pool_size:
+                try:
+                    if self.tessdata_path:
+                        api = tesserocr.PyTessBaseAPI(path=self.tessdata_path)
+                    else:
+                        api = tesserocr.PyTessBaseAPI()
+                except Exception as e:
+                    # Ex: tessdata não encontrado. Sem pool, tudo vai pelo pytesseract
+                    print(f"[!] Falha ao carregar o tesserocr ({e}). OCR via pytesseract; "
+                          "configure ocr.tessdata_path no settings.yaml.")
+                    self.persistent = False
+                    return None
+                self._created += 1
+                return api
+        try:
+            return self._apis.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Libera as APIs carregadas (fim do processo)."""
+        while True:
+            try:
+                self._apis.get_nowait().End()
+            except queue.Empty:
+                break
 
 class OCRManager:
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
-        self.log = emulator_manager.log
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
+        self.log = self.ctx.log
         
-        # AJUSTE AQUI: Caminho do executável no novo PC
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        # Motor compartilhado; o caminho do executável fica em settings.yaml (ocr.tesseract_cmd)
+        self.engine = TesseractEngine.shared(self.emu.config.settings)
 
     def _preprocess_for_ocr(self, img_array):
         """
@@ -28,10 +180,17 @@ class OCRManager:
         
         return thresh
 
-    def get_text_from_region(self, region_name):
+    def read_text(self, crop_img, psm=7, whitelist=None):
+        """Pré-processa um recorte BGR e executa o OCR (com cache)."""
+        processed = self._preprocess_for_ocr(crop_img)
+        return self.engine.recognize(processed, psm=psm, whitelist=whitelist)
+
+    def get_text_from_region(self, region_name, frame=None, psm=7):
         """
         Lê texto de uma região definida no config/timings.json.
         Ex de região no JSON: "regiao_nickname": {"x": 100, "y": 20, "w": 200, "h": 50}
+        :param frame: Frame já capturado (opcional); sem ele usa a tela atual.
+        :param psm: Modo de segmentação do Tesseract (7 = uma linha, 6 = bloco de texto).
         """
         # 1. Pega as coordenadas do JSON
         reg = self.emu.config.timings.get("ui_regions", {}).get(region_name)
@@ -39,22 +198,16 @@ class OCRManager:
             self.log.error(f"Região {region_name} não definida no timings.json")
             return ""
 
-        # 2. Tira o print e carrega
-        from actions.image_recognition import ImageRecognition
-        ir = ImageRecognition(self.emu, self.instance_id)
-        screen_path = ir._take_screenshot()
-        img = cv2.imread(screen_path)
+        # 2. Frame atual (em memória, compartilhado com a visão)
+        img = frame if frame is not None else self.ctx.vision.capture_frame()
+        if img is None:
+            self.log.error(f"Falha ao capturar a tela para OCR ({region_name}).")
+            return ""
 
         # 3. Recorta a imagem (Crop) [y:y+h, x:x+w]
         crop_img = img[reg['y']:reg['y']+reg['h'], reg['x']:reg['x']+reg['w']]
         
-        # 4. Pré-processa
-        processed = self._preprocess_for_ocr(crop_img)
-        
-        # 5. OCR - PSM 6 (Assume um único bloco de texto) ou PSM 7 (Uma única linha)
-        custom_config = r'--oem 3 --psm 7'
-        text = pytesseract.image_to_string(processed, config=custom_config)
-        
-        result = text.strip()
+        # 4. Pré-processa + OCR
+        result = self.read_text(crop_img, psm=psm)
         self.log.info(f"OCR ({region_name}): {result}")
-        return result
\ No newline at end of file
+        return result
@@ -0,0 +1,56 @@
+import cv2
+
+def match_full(img_gray, template_gray):
+    """
+    Template Matching (TM_CCOEFF_NORMED) em resolução cheia.
+    :return: Tupla (confiança, (x, y) do canto superior esquerdo).
+    """
+    res = cv2.matchTemplate(img_gray, template_gray, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    return max_val, max_loc
+
+def match_pyramid(img_gray, template_gray, scale=0.5, candidates=3, min_size=12):
+    """
+    Matching grosso-para-fino: procura no frame e no template reduzidos e
+    refina só os melhores candidatos em resolução cheia.
+    Mantém o mesmo retorno de match_full (a confiança final é a da resolução cheia).
+
+    :param scale: Fator de redução da etapa grossa (0.5 = metade).
+    :param candidates: Quantos picos da etapa grossa são refinados.
+    :param min_size: Menor lado (px) aceito para o template reduzido; abaixo disso usa match_full.
+    """
+    th, tw = template_gray.shape[:2]
+    ih, iw = img_gray.shape[:2]
+    if min(th, tw) * scale < min_size:
+        return match_full(img_gray, template_gray)
+
+    small_img = cv2.resize(img_gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    small_tpl = cv2.resize(template_gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if small_tpl.shape[0] > small_img.shape[0] or small_tpl.shape[1] > small_img.shape[1]:
+        return match_full(img_gray, template_gray)
+
+    res = cv2.matchTemplate(small_img, small_tpl, cv2.TM_CCOEFF_NORMED)
+    sth, stw = small_tpl.shape[:2]
+    # Folga da janela de refino: cobre o erro de arredondamento da redução
+    pad = int(round(1 / scale)) + 2
+
+    best_val, best_loc = -1.0, (0, 0)
+    for _ in range(candidates):
+        _, coarse_val, _, coarse_loc = cv2.minMaxLoc(res)
+        if coarse_val <= -1.0:
+            break
+
+        x0 = max(0, int(coarse_loc[0] / scale) - pad)
+        y0 = max(0, int(coarse_loc[1] / scale) - pad)
+        x1 = min(iw, int(coarse_loc[0] / scale) + tw + pad)
+        y1 = min(ih, int(coarse_loc[1] / scale) + th + pad)
+        if x1 - x0 >= tw and y1 - y0 >= th:
+            val, loc = match_full(img_gray[y0:y1, x0:x1], template_gray)
+            if val > best_val:
+                best_val, best_loc = val, (loc[0] + x0, loc[1] + y0)
+
+        # Suprime a vizinhança do pico para o próximo candidato ser outro lugar
+        sx0, sy0 = max(0, coarse_loc[0] - stw // 2), max(0, coarse_loc[1] - sth // 2)
+        res[sy0:coarse_loc[1] + sth // 2 + 1, sx0:coarse_loc[0] + stw // 2 + 1] = -1.0
+
+    return best_val, best_loc
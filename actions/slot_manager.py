@@ -1,9 +1,7 @@
 import time
 import random
-from actions.click_actions import ClickActions
-# Importação hipotética do seu módulo de registro
-# Caso o nome do arquivo seja diferente, ajuste aqui
-from core.account_registry import AccountRegistry 
+from core.instance_context import InstanceContext
+from actions.digit_reader import DigitReader
 
 class SlotManager:
     """
@@ -11,27 +9,25 @@ class SlotManager:
     Responsável por: OCR de saldo, Watchdog de freeze e Registro final de status.
     """
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
-        self.log = emulator_manager.log
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
+        self.log = self.ctx.log
         
         # Carrega configurações do settings.yaml (via emulator_manager)
-        self.config = getattr(self.emu, 'settings', {}).get('slot_machine', {})
+        self.config = self.emu.config.settings.get('slot_machine', {})
         
-        from actions.image_recognition import ImageRecognition
-        self.vision = ImageRecognition(self.emu, self.instance_id)
-        self.click = ClickActions(self.emu, self.instance_id)
+        self.vision = self.ctx.vision
+        self.click = self.ctx.click
+        self.digits = DigitReader(self.ctx)
         
-        # Inicializa o registrador de contas
-        self.registry = AccountRegistry()
+        # Registrador de contas compartilhado da instância
+        self.registry = self.ctx.registry
 
-    def _get_balance(self):
-        """Lê o saldo atual via OCR para segurança financeira."""
-        roi_saldo = (800, 10, 150, 40) # Ajustar conforme a resolução
+    def _get_balance(self, frame=None):
+        """Lê o saldo atual (ui_regions.chips_amount) para segurança financeira."""
         try:
-            raw_text = self.vision.get_text_from_region(roi_saldo)
-            clean_text = ''.join(filter(str.isdigit, raw_text))
-            return int(clean_text) if clean_text else None
+            return self.digits.read_int("chips_amount", frame=frame)
         except Exception as e:
             self.log.error(f"[-] Erro OCR: {e}")
             return None
@@ -42,7 +38,12 @@ class SlotManager:
         """
         duration = self.config.get('default_duration_minutes', 20)
         lines = self.config.get('lines', 9)
-        min_balance = 2000 
+        min_balance = self.config.get('min_balance', 2000)
+        # Sem glifos nem tesserocr, cada leitura abriria um processo do Tesseract: volta ao check a cada 5 min
+        every_spin = self.config.get('balance_check_every_spin', True)
+        if every_spin and not self.digits.is_fast():
+            every_spin = False
+            self.log.info("[*] Sem glifos de dígitos (assets/digits) nem tesserocr: saldo checado a cada 5 minutos.")
 
         self.log.info(f"[*] Workflow Slot Iniciado - Instância {self.instance_id}")
 
@@ -58,8 +59,8 @@ class SlotManager:
         while time.time() < end_time:
             current_minute = int((time.time() - start_time) / 60)
 
-            # Check de Saldo (OCR) a cada 5 min
-            if current_minute % 5 == 0 and current_minute != last_balance_check:
+            # Check de Saldo: a cada giro (leitura numérica barata) ou a cada 5 min
+            if every_spin or (current_minute % 5 == 0 and current_minute != last_balance_check):
                 saldo = self._get_balance()
                 if saldo is not None and saldo < min_balance:
                     self.log.error(f"[🚨] Saldo Crítico: {saldo}. Abortando para preservar conta.")
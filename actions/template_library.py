@@ -0,0 +1,108 @@
+import cv2
+import os
+import threading
+
+class TemplateLibrary:
+    """
+    Biblioteca única (por processo) dos templates de assets/buttons.
+    Cada imagem é lida e convertida para escala de cinza uma só vez e fica
+    guardada como array somente leitura, compartilhada por todas as threads.
+    A busca por nome ignora maiúsculas/minúsculas (.png x .PNG).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Retorna a instância global da biblioteca."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self, base_dir="assets/buttons"):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        self._templates = {}      # caminho real -> array em cinza
+        self._by_path = {}        # caminho relativo (minúsculo) -> caminho real
+        self._by_name = {}        # nome do arquivo (minúsculo) -> caminho real
+        self._reported = set()    # nomes ausentes já avisados no log
+        self._build_index()
+
+    def _build_index(self):
+        """Indexa todos os arquivos de imagem da pasta de assets."""
+        if not os.path.isdir(self.base_dir):
+            return
+
+        for root, dirs, files in os.walk(self.base_dir):
+            dirs.sort()
+            for file_name in sorted(files):
+                if not file_name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')):
+                    continue
+                full_path = os.path.join(root, file_name)
+                rel_path = os.path.relpath(full_path, self.base_dir).replace('\\', '/')
+                self._by_path[rel_path.lower()] = full_path
+                # Em caso de nomes repetidos em pastas diferentes, vale o primeiro (ordem alfabética)
+                self._by_name.setdefault(file_name.lower(), full_path)
+
+    def resolve(self, template_name):
+        """
+        Converte o nome usado no código no caminho real do arquivo.
+        Tenta o caminho relativo completo e, depois, apenas o nome do arquivo.
+        """
+        key = template_name.replace('\\', '/').strip('/').lower()
+        if key in self._by_path:
+            return self._by_path[key]
+        return self._by_name.get(key.rsplit('/', 1)[-1])
+
+    def get(self, template_name):
+        """Retorna o template em escala de cinza (somente leitura) ou None."""
+        path = self.resolve(template_name)
+        if path is None:
+            return None
+
+        with self._lock:
+            template = self._templates.get(path)
+            if template is None:
+                template = self._load(path)
+                if template is not None:
+                    self._templates[path] = template
+        return template
+
+    def _load(self, path):
+        image = cv2.imread(path)
+        if image is None:
+            return None
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray.flags.writeable = False
+        return gray
+
+    def preload(self):
+        """Carrega todos os assets indexados. Retorna a quantidade carregada."""
+        for path in self._by_path.values():
+            with self._lock:
+                if path not in self._templates:
+                    template = self._load(path)
+                    if template is not None:
+                        self._templates[path] = template
+        return len(self._templates)
+
+    def missing(self, template_names):
+        """Lista os nomes que não correspondem a nenhum arquivo legível."""
+        return [name for name in template_names if self.get(name) is None]
+
+    def report_missing(self, template_names, log):
+        """Registra no log (uma vez por nome) os templates ausentes."""
+        missing = self.missing(template_names)
+        for name in missing:
+            self.report_once(name, log)
+        return missing
+
+    def report_once(self, template_name, log):
+        """Avisa sobre um template ausente apenas na primeira ocorrência."""
+        with self._lock:
+            if template_name in self._reported:
+                return
+            self._reported.add(template_name)
+        log.error(f"Arquivo de template ausente: {os.path.join(self.base_dir, template_name)}")
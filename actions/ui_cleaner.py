@@ -1,5 +1,6 @@
 import os
 import time
+from core.instance_context import InstanceContext
 
 class UICleaner:
     """
@@ -7,10 +8,11 @@ class UICleaner:
     Atualizado para lidar com promoções pós-roleta.
     """
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
         self.vision = None 
-        self.log = emulator_manager.log
+        self.log = self.ctx.log
         
         # Lista expandida com assets de promoções específicas
         self.pop_up_elements = [
@@ -29,26 +31,25 @@ class UICleaner:
         Tenta localizar e clicar em botões de fechar. 
         Aumentamos as iterações para lidar com o empilhamento de promoções.
         """
-        from actions.image_recognition import ImageRecognition
         if not self.vision:
-            self.vision = ImageRecognition(self.emu, self.instance_id)
+            self.vision = self.ctx.vision
 
         self.log.info(f"[*] Iniciando limpeza de UI na Instância {self.instance_id}...")
         
-        found_any = False
-        for i in range(iterations):
-            current_found = False
-            for element in self.pop_up_elements:
-                # Busca na subpasta ui/ conforme padrão do projeto
-                pos = self.vision.find_element(f"ui/{element}", threshold=0.7, click=True)
-                
-                if pos:
-                    self.log.info(f"[!] Promoção/Pop-up detectado: {element}")
-                    time.sleep(2.0) # Tempo aumentado para animações pesadas de promoções
-                    current_found = True
-                    found_any = True
-            
-            if not current_found:
+        # Busca na subpasta ui/ conforme padrão do projeto
+        templates = [f"ui/{element}" for element in self.pop_up_elements]
+
+        # Cada passada faz um único print e testa todos os pop-ups de uma vez.
+        # Fecha o de maior confiança e reescaneia (o tap invalida o frame).
+        closed = 0
+        max_closes = iterations * len(self.pop_up_elements)
+        while closed < max_closes:
+            matches = self.vision.find_any(templates, threshold=0.7, click=True)
+            if not matches:
                 break
+
+            self.log.info(f"[!] Promoção/Pop-up detectado: {matches[0][0]}")
+            time.sleep(2.0) # Tempo aumentado para animações pesadas de promoções
+            closed += 1
                 
-        return found_any
\ No newline at end of file
+        return closed > 0
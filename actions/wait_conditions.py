@@ -0,0 +1,195 @@
+import time
+from actions.frame_analysis import frame_signature, frames_differ, frames_differ_locally, CELL_TOLERANCE
+
+class Condition:
+    """
+    Condição de espera. check() devolve um valor verdadeiro quando satisfeita.
+    Pode ser combinada com | (qualquer uma) e & (todas).
+    """
+
+    def reset(self):
+        """Chamado no início de cada espera (zera o estado interno)."""
+
+    def check(self):
+        raise NotImplementedError
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+    def __and__(self, other):
+        return AllOf(self, other)
+
+
+class ElementAppears(Condition):
+    """Satisfeita quando o template aparece. Devolve a posição (x, y)."""
+
+    def __init__(self, vision, template_name, threshold=0.8, region=None):
+        self.vision = vision
+        self.template_name = template_name
+        self.threshold = threshold
+        self.region = region
+
+    def check(self):
+        return self.vision.find_element(self.template_name, threshold=self.threshold, region=self.region)
+
+
+class ElementDisappears(ElementAppears):
+    """Satisfeita quando o template não está mais na tela."""
+
+    def check(self):
+        return not super().check()
+
+
+class ScreenStable(Condition):
+    """Satisfeita quando a tela fica sem mudanças por 'stable_for' segundos."""
+
+    def __init__(self, vision, stable_for=1.5, tolerance=2.0):
+        self.vision = vision
+        self.stable_for = stable_for
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        self._last_sig = None
+        self._since = None
+
+    def check(self):
+        frame = self.vision.capture_frame(use_cache=False)
+        if frame is None:
+            return False
+
+        now = time.time()
+        sig = frame_signature(frame)
+        if self._last_sig is None or frames_differ(sig, self._last_sig, self.tolerance):
+            self._last_sig = sig
+            self._since = now
+            return False
+        return now - self._since >= self.stable_for
+
+
+class ScreenChanged(Condition):
+    """
+    Satisfeita quando alguma parte da tela difere da referência (mudança local,
+    então um diálogo pequeno já conta).
+    Sem referência explícita, usa a tela de antes do último tap/swipe
+    (ou, se não houver, a tela do início da espera).
+    """
+
+    def __init__(self, vision, reference=None, cell_tolerance=CELL_TOLERANCE):
+        self.vision = vision
+        self.cell_tolerance = cell_tolerance
+        self._reference = frame_signature(reference) if reference is not None else None
+        self._sig = self._reference
+
+    def reset(self):
+        if self._reference is not None:
+            self._sig = self._reference
+            return
+        before_input, _ = self.vision.input_reference()
+        if before_input is None:
+            before_input = self.vision.capture_frame()
+        self._sig = frame_signature(before_input) if before_input is not None else None
+
+    def check(self):
+        frame = self.vision.capture_frame(use_cache=False)
+        if frame is None:
+            return False
+        if self._sig is None:
+            self._sig = frame_signature(frame)
+            return False
+        return frames_differ_locally(frame_signature(frame), self._sig, self.cell_tolerance)
+
+
+class Predicate(Condition):
+    """Adapta qualquer função sem argumentos como condição."""
+
+    def __init__(self, func):
+        self.func = func
+
+    def check(self):
+        return self.func()
+
+
+class AnyOf(Condition):
+    """Satisfeita quando qualquer uma das condições for; devolve o primeiro resultado."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def reset(self):
+        for condition in self.conditions:
+            condition.reset()
+
+    def check(self):
+        for condition in self.conditions:
+            result = condition.check()
+            if result:
+                return result
+        return False
+
+
+class AllOf(Condition):
+    """Satisfeita quando todas as condições forem ao mesmo tempo; devolve a lista de resultados."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def reset(self):
+        for condition in self.conditions:
+            condition.reset()
+
+    def check(self):
+        results = []
+        for condition in self.conditions:
+            result = condition.check()
+            if not result:
+                return False
+            results.append(result)
+        return results
+
+
+class Then(Condition):
+    """Condições em sequência: cada uma só é avaliada depois da anterior ser satisfeita."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+        self._index = 0
+        self._result = None
+
+    def reset(self):
+        self._index = 0
+        self._result = None
+        for condition in self.conditions:
+            condition.reset()
+
+    def check(self):
+        while self._index < len(self.conditions):
+            result = self.conditions[self._index].check()
+            if not result:
+                return False
+            self._result = result
+            self._index += 1
+        # Sequência concluída: reavaliações (ex: dentro de um AllOf) mantêm o resultado final
+        return self._result
+
+
+def wait_until(condition, timeout=30, interval=0.5):
+    """
+    Avalia a condição até ela ser satisfeita ou o tempo acabar.
+    :return: O resultado da condição ou None em caso de timeout.
+    """
+    condition.reset()
+    deadline = time.time() + timeout
+    while True:
+        result = condition.check()
+        if result:
+            return result
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
+
+
+def wait_screen_settled(vision, timeout=10, stable_for=1.5):
+    """Aguarda a tela reagir ao último input e depois parar de mudar (ex: animações)."""
+    return wait_until(Then(ScreenChanged(vision), ScreenStable(vision, stable_for=stable_for)), timeout=timeout)
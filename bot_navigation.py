@@ -1,15 +1,12 @@
-from core.emulator_manager import EmulatorManager
-from actions.image_recognition import ImageRecognition
-from actions.click_actions import ClickActions
+from core.instance_context import InstanceContext
 from actions.ui_cleaner import UICleaner
 from core.block_handler import BlockHandler
 from core.instance_manager import InstanceManager 
-from core.account_registry import AccountRegistry # Tarefa 9: Registro JSON
 from actions.daily_bonus import DailyBonus
 from actions.maturation_manager import MaturationManager
 from actions.slot_manager import SlotManager
 from actions.nickname_manager import NicknameManager
-import time
+from actions.wait_conditions import wait_screen_settled
 
 class AccountCreatorBot:
     """
@@ -18,20 +15,21 @@ class AccountCreatorBot:
     """
     def __init__(self, instance_id):
         # 1. Inicialização da infraestrutura e logs
-        self.emu = EmulatorManager(instance_id=instance_id)
-        self.vision = ImageRecognition(self.emu, instance_id=instance_id)
-        self.click = ClickActions(self.emu, instance_id=instance_id)
-        self.log = self.emu.log
+        self.ctx = InstanceContext(instance_id)
+        self.emu = self.ctx.emu
+        self.vision = self.ctx.vision
+        self.click = self.ctx.click
+        self.log = self.ctx.log
         
-        # 2. Inicialização dos módulos de lógica de negócio
-        self.block_handler = BlockHandler(self.emu, instance_id=instance_id)
+        # 2. Inicialização dos módulos de lógica de negócio (todos compartilham o contexto)
+        self.block_handler = BlockHandler(self.ctx)
         self.inst_manager = InstanceManager(self.emu) 
-        self.registry = AccountRegistry() # Banco de dados JSON
-        self.cleaner = UICleaner(self.emu, instance_id=instance_id)
-        self.bonus = DailyBonus(self.emu, instance_id=instance_id)
-        self.slot = SlotManager(self.emu, instance_id=instance_id)
-        self.nick = NicknameManager(self.emu, instance_id=instance_id)
-        self.maturation = MaturationManager(self.emu, instance_id=instance_id)
+        self.registry = self.ctx.registry # Tarefa 9: Registro de contas
+        self.cleaner = UICleaner(self.ctx)
+        self.bonus = DailyBonus(self.ctx)
+        self.slot = SlotManager(self.ctx)
+        self.nick = NicknameManager(self.ctx)
+        self.maturation = MaturationManager(self.ctx)
 
     def run_initial_navigation(self):
         """Workflow completo com segurança, maturação e finalização."""
@@ -47,12 +45,13 @@ class AccountCreatorBot:
         # --- PASSO 2: TERMOS DE USO ---
         if self.vision.wait_for_element("aceitar.png", timeout=15, click_on_find=True):
             self.log.info("[1/9] Termos de uso aceitos.")
-            time.sleep(2)
+            wait_screen_settled(self.vision, timeout=2, stable_for=1)
 
         # --- PASSO 3: LOGIN DE VISITANTE ---
         if self.vision.wait_for_element("visitante.png", timeout=15, click_on_find=True):
             self.log.info("[2/9] Criando conta de visitante...")
-            time.sleep(12) # Tempo para o servidor registrar a nova conta
+            # Aguarda o servidor registrar a nova conta (tela muda e estabiliza)
+            wait_screen_settled(self.vision, timeout=12, stable_for=2)
         else:
             self.log.error("[-] Falha: Botão 'Visitante' não encontrado.")
             return "FAILED"
@@ -81,7 +80,7 @@ class AccountCreatorBot:
         # --- PASSO 8: NAVEGAÇÃO PARA POKER ---
         self.log.info("[7/9] Transicionando para mesas de Poker Brasil...")
         if self.vision.wait_for_element("poker_brasil.png", timeout=20, click_on_find=True):
-            time.sleep(5)
+            wait_screen_settled(self.vision, timeout=5)
             if self.vision.wait_for_element("jogar_agora.png", timeout=15, click_on_find=True):
                 
                 # --- PASSO 9: MATURAÇÃO EM MESA (Tarefa 5) ---
@@ -1,15 +1,14 @@
-from core.emulator_manager import EmulatorManager
-from actions.image_recognition import ImageRecognition
-from actions.click_actions import ClickActions
+from core.instance_context import InstanceContext
 from actions.ui_cleaner import UICleaner
 from core.block_handler import BlockHandler
 from core.instance_manager import InstanceManager 
-from core.account_registry import AccountRegistry
 from actions.daily_bonus import DailyBonus
 from actions.maturation_manager import MaturationManager
 from actions.slot_manager import SlotManager
 from actions.nickname_manager import NicknameManager
-import time
+from actions.template_library import TemplateLibrary
+from actions.wait_conditions import wait_until, wait_screen_settled, ElementAppears, ScreenChanged, ScreenStable, Then
+from core.fleet_scheduler import HEAVY, LIGHT
 import os
 
 class NewAccountOrchestrator:
@@ -17,23 +16,39 @@ class NewAccountOrchestrator:
     Orquestrador Master: Unifica o Fluxo Operacional Completo em 5 Grandes Blocos.
     Responsável por levar a conta da criação até a maturação completa (20 min).
     """
+    # Templates usados pelo fluxo; conferidos na inicialização para não falhar no meio do ciclo
+    REQUIRED_TEMPLATES = [
+        "aceitar.png", "visitante.png", "poker_brasil.png", "jogar.png", "roleta_center.PNG",
+        "btn_jogar_ja.png", "btn_menu_mesa.png", "btn_sair_confirmar.png", "ui/mesa_ativa.png",
+        "icone_perfil.PNG", "btn_editar_nome.PNG", "menssagem_nome.PNG", "btn_confirmar_nome.PNG",
+        "confirmar_popup_nome.PNG", "slot_9_linhas.PNG", "btn_girar_auto.PNG", "fechar_ganho.PNG",
+        "popup_bloqueio.png",
+    ]
+
     def __init__(self, instance_id):
-        self.emu = EmulatorManager(instance_id=instance_id)
-        self.vision = ImageRecognition(self.emu, instance_id=instance_id)
-        self.click = ClickActions(self.emu, instance_id=instance_id)
-        self.log = self.emu.log
+        # Um único contexto por instância: emulador, visão, input, OCR e registro
+        self.ctx = InstanceContext(instance_id)
+        self.emu = self.ctx.emu
+        self.vision = self.ctx.vision
+        self.click = self.ctx.click
+        self.log = self.ctx.log
         
-        self.block_handler = BlockHandler(self.emu, instance_id=instance_id)
+        self.block_handler = BlockHandler(self.ctx)
         self.inst_manager = InstanceManager(self.emu) 
-        self.registry = AccountRegistry()
-        self.cleaner = UICleaner(self.emu, instance_id=instance_id)
-        self.bonus = DailyBonus(self.emu, instance_id=instance_id)
-        self.slot = SlotManager(self.emu, instance_id=instance_id)
-        self.nick = NicknameManager(self.emu, instance_id=instance_id)
-        self.maturation = MaturationManager(self.emu, instance_id=instance_id)
+        self.registry = self.ctx.registry
+        self.cleaner = UICleaner(self.ctx)
+        self.bonus = DailyBonus(self.ctx)
+        self.slot = SlotManager(self.ctx)
+        self.nick = NicknameManager(self.ctx)
+        self.maturation = MaturationManager(self.ctx)
 
         self.package = "com.playshoo.texaspoker.romania"
 
+        required = self.REQUIRED_TEMPLATES + [f"ui/{e}" for e in self.cleaner.pop_up_elements]
+        missing = TemplateLibrary.shared().report_missing(required, self.log)
+        if missing:
+            self.log.warning(f"[!] {len(missing)} template(s) ausente(s) em assets/buttons/. As etapas que dependem deles serão puladas.")
+
     def run(self, watchdog_callback=None):
         """
         Execução unificada do Fluxo Operacional.
@@ -44,49 +59,60 @@ class NewAccountOrchestrator:
         # 1. PREPARAÇÃO DAS INSTÂNCIAS
         # ======================================================================
         # (Clonagem e Proxy são validados no main.py antes deste método)
-        if not self.emu.launch_instance():
-            self.log.error("❌ Erro ao ligar emulador.")
-            return "FAILED"
+        # Etapas HEAVY (boot, app, login) disputam vagas limitadas; as LIGHT não esperam
+        with self.ctx.phase("boot", HEAVY):
+            if not self.emu.launch_instance():
+                self.log.error("❌ Erro ao ligar emulador.")
+                return "FAILED"
 
         # ======================================================================
         # 2. INICIALIZAÇÃO DO JOGO
         # ======================================================================
-        self.emu.launch_app(self.package)
-        
-        # Sequência de Login: Aceitar -> Visitante -> Poker Brasil -> Jogar
-        login_sequence = ["aceitar.png", "visitante.png", "poker_brasil.png", "jogar.png"]
-        for btn in login_sequence:
-            if self.vision.wait_for_element(btn, timeout=20, click_on_find=True):
-                self.log.info(f"[+] Botão {btn} clicado.")
-                time.sleep(3)
-        
-        # Roleta Inicial
-        if self.vision.wait_for_element("roleta_center.PNG", timeout=30, click_on_find=True):
-            self.log.info("[+] Girando roleta inicial.")
-            time.sleep(12) 
+        with self.ctx.phase("login", HEAVY):
+            self.emu.launch_app(self.package)
 
-        # Limpeza de Promoções Pós-Roleta
-        self.cleaner.clean_ui(iterations=3)
+            # Sequência de Login: Aceitar -> Visitante -> Poker Brasil -> Jogar
+            login_sequence = ["aceitar.png", "visitante.png", "poker_brasil.png", "jogar.png"]
+            for btn in login_sequence:
+                if self.vision.wait_for_element(btn, timeout=20, click_on_find=True):
+                    self.log.info(f"[+] Botão {btn} clicado.")
+                    wait_screen_settled(self.vision, timeout=3, stable_for=1)
+
+        with self.ctx.phase("roleta", LIGHT):
+            # Roleta Inicial
+            if self.vision.wait_for_element("roleta_center.PNG", timeout=30, click_on_find=True):
+                self.log.info("[+] Girando roleta inicial.")
+                # Termina quando o botão de coletar aparece ou a roleta para de girar
+                wait_until(
+                    ElementAppears(self.vision, "ui/coletar_roleta.png", threshold=0.7)
+                    | Then(ScreenChanged(self.vision), ScreenStable(self.vision, stable_for=2)),
+                    timeout=12
+                )
+
+            # Limpeza de Promoções Pós-Roleta
+            self.cleaner.clean_ui(iterations=3)
 
         # ======================================================================
         # 3. ACESSO À MESA (QUICK EXIT)
         # ======================================================================
         # Entra em "Jogar Já", espera 10s e sai
-        if not self.maturation.quick_table_exit():
-            self.log.warning("[!] Falha no Quick Exit, tentando seguir fluxo...")
+        with self.ctx.phase("mesa", LIGHT):
+            if not self.maturation.quick_table_exit():
+                self.log.warning("[!] Falha no Quick Exit, tentando seguir fluxo...")
 
-        # Limpa promoções restantes após sair da mesa
-        self.cleaner.clean_ui(iterations=2)
+            # Limpa promoções restantes após sair da mesa
+            self.cleaner.clean_ui(iterations=2)
 
         # ======================================================================
         # 4. SLOT CLÁSSICO
         # ======================================================================
-        # Troca o Nickname antes da maturação
-        nome_gerado = self.nick.change_nickname()
-        
-        self.log.info("🎰 Entrando no Slot Clássico...")
-        # Executa por 20 min com monitoramento de saldo e watchdog
-        slot_sucesso = self.slot.setup_and_run(watchdog_callback=watchdog_callback)
+        with self.ctx.phase("maturacao", LIGHT):
+            # Troca o Nickname antes da maturação
+            nome_gerado = self.nick.change_nickname()
+
+            self.log.info("🎰 Entrando no Slot Clássico...")
+            # Executa por 20 min com monitoramento de saldo e watchdog
+            slot_sucesso = self.slot.setup_and_run(watchdog_callback=watchdog_callback)
 
         if not slot_sucesso:
             self.log.error("❌ Ciclo de maturação interrompido (Saldo ou Erro).")
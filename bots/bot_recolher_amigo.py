@@ -1,11 +1,11 @@
-import threading
 import time
 import os
-from core.emulator_manager import EmulatorManager
-from actions.image_recognition import ImageRecognition
-from actions.click_actions import ClickActions
+from core.instance_context import InstanceContext
 from actions.ui_cleaner import UICleaner
+from actions.wait_conditions import wait_screen_settled
 from core.instance_manager import InstanceManager
+from core.emulator_manager import EmulatorManager
+from core.fleet_scheduler import FleetScheduler
 
 class BotOrquestradorMestre:
     """
@@ -13,11 +13,12 @@ class BotOrquestradorMestre:
     Segue rigorosamente as 10 etapas descritas no PDF técnico.
     """
     def __init__(self, instance_id):
-        self.emu = EmulatorManager(instance_id=instance_id)
-        self.vision = ImageRecognition(self.emu, instance_id=instance_id)
-        self.click = ClickActions(self.emu, instance_id=instance_id)
-        self.log = self.emu.log
-        self.cleaner = UICleaner(self.emu, instance_id=instance_id)
+        self.ctx = InstanceContext(instance_id)
+        self.emu = self.ctx.emu
+        self.vision = self.ctx.vision
+        self.click = self.ctx.click
+        self.log = self.ctx.log
+        self.cleaner = UICleaner(self.ctx)
         
         # Paths de assets e pacote
         self.img_path = "buttons/bot_recolher_amigo/"
@@ -38,7 +39,7 @@ class BotOrquestradorMestre:
             if self.vision.exists("/02_roda_fortuna.PNG"):
                 self.log.info(" Roleta inicial detectada.")
                 self.vision.wait_for_element("/03_roleta.PNG", click_on_find=True)
-                time.sleep(12) # Tempo para animação
+                wait_screen_settled(self.vision, timeout=12, stable_for=2) # Animação da roleta
 
             # 4. MÓDULO AMIGOS (EXECUTADO 3 VEZES)
             for ciclo in range(1, 4):
@@ -54,7 +55,7 @@ class BotOrquestradorMestre:
                 for giro in range(2): # 5.2 Execução de 2 giros
                     self.log.info(f"Giro de roleta {giro + 1}/2")
                     self.vision.wait_for_element("12_rolar_roleta.PNG", timeout=10, click_on_find=True)
-                    time.sleep(8) # Aguarda resultado
+                    wait_screen_settled(self.vision, timeout=8, stable_for=2) # Aguarda resultado
                 self.vision.wait_for_element("12_sair_roleta.PNG", timeout=10, click_on_find=True) #
 
             # ======================================================================
@@ -79,7 +80,7 @@ class BotOrquestradorMestre:
                         self.log.info("[+] Itens detectados! Realizando abertura da Noko Box.")
                         # Executa o clique de abertura conforme a posição da tela validada [cite: 43]
                         self.click.click_at_element(f"{self.img_path}tela_noko_box.png")
-                        time.sleep(5) # Aguarda animação de abertura
+                        wait_screen_settled(self.vision, timeout=5) # Aguarda animação de abertura
                     else:
                         self.log.info("[-] Noko Box identificada como vazia. Pulando coleta.")
 
@@ -122,16 +123,20 @@ class BotOrquestradorMestre:
     def process_gifts(self):
         """Lógica de loop para recolher e enviar presentes."""
         max_interacoes = 30 # Limite para evitar loop infinito
+        sem_presentes = f"{self.img_path}sem_presentes.png"
+        botoes = [
+            f"{self.img_path}botao_recolher_presente.png",
+            f"{self.img_path}botao_enviar_presente.png",
+            f"{self.img_path}botao_enviar_presente_2.png",
+        ]
         for _ in range(max_interacoes):
-            if self.vision.exists(f"{self.img_path}sem_presentes.png"):
-                break
-            
-            recolheu = self.vision.wait_for_element(f"{self.img_path}botao_recolher_presente.png", timeout=2, click_on_find=True)
-            enviou_01 = self.vision.wait_for_element(f"{self.img_path}botao_enviar_presente.png", timeout=2, click_on_find=True)
-            enviou_02 = self.vision.wait_for_element(f"{self.img_path}botao_enviar_presente_2.png", timeout=2, click_on_find=True)
-            
-            if not recolheu and not enviou_01 and not enviou_02:
+            # Um único print para o aviso de lista vazia e os três botões
+            matches = self.vision.find_any([sem_presentes] + botoes)
+            if not matches or any(name == sem_presentes for name, _, _ in matches):
                 break
+
+            _, (x, y), _ = matches[0]
+            self.click.tap(x, y, normalize=False)
             time.sleep(1)
 
 # ==============================================================================
@@ -144,35 +149,12 @@ def executar_instancia(instance_id):
     bot.run()
 
 if __name__ == "__main__":
-    inst_manager = InstanceManager()
-    lista_instancias = inst_manager.get_all_instance_ids()
-    
-    LIMIT_SIMULTANEO = 15 # Conforme solicitado
-    DELAY_ABERTURA = 20    # Segundos entre cada abertura
-    threads_ativas = []
+    inst_manager = InstanceManager(EmulatorManager(instance_id=0))
+    lista_instancias = [int(inst['id']) for inst in inst_manager.list_all_instances()]
 
     print(f"🔥 Iniciando Orquestrador para {len(lista_instancias)} instâncias.")
 
-    for i_id in lista_instancias:
-        # Limpa referências de threads mortas
-        threads_ativas = [t for t in threads_ativas if t.is_alive()]
-
-        # Gerenciamento de limite simultâneo
-        while len(threads_ativas) >= LIMIT_SIMULTANEO:
-            time.sleep(5)
-            threads_ativas = [t for t in threads_ativas if t.is_alive()]
-
-        # Dispara nova instância
-        t = threading.Thread(target=executar_instancia, args=(i_id,))
-        t.daemon = True # Morre se o script principal parar
-        t.start()
-        threads_ativas.append(t)
-
-        print(f"📡 Instância {i_id} lançada. Aguardando {DELAY_ABERTURA}s para a próxima...")
-        time.sleep(DELAY_ABERTURA)
-
-    # Aguarda o término de todas as threads antes de fechar o terminal
-    for t in threads_ativas:
-        t.join()
+    # Concorrência e ritmo de abertura definidos pela seção 'scheduler' do settings.yaml
+    FleetScheduler(executar_instancia).run(lista_instancias)
 
-    print("Todas as instâncias foram processadas.")
\ No newline at end of file
+    print("Todas as instâncias foram processadas.")
@@ -1,38 +1,258 @@
+import atexit
 import json
 import os
+import queue
+import sqlite3
+import threading
 from datetime import datetime
 
+# Gravação (write-behind) compartilhada por todas as instâncias do processo, uma por banco
+_writers = {}
+_writers_lock = threading.Lock()
+
+class RegistryWriter(threading.Thread):
+    """
+    Gravador assíncrono do registro de contas.
+    Recebe as alterações de todas as instâncias numa fila e as grava em lotes
+    (uma transação por lote) numa thread própria, sem bloquear as threads dos bots.
+    """
+
+    def __init__(self, db_path, batch_size=100, flush_interval=0.5):
+        super().__init__(name=f"RegistryWriter-{os.path.basename(db_path)}", daemon=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._conn = None
+
+    @classmethod
+    def shared(cls, db_path, batch_size=100, flush_interval=0.5):
+        """Retorna o gravador do banco (criando e iniciando na primeira chamada)."""
+        key = os.path.abspath(db_path)
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None or not writer.is_alive():
+                writer = cls(db_path, batch_size=batch_size, flush_interval=flush_interval)
+                writer.start()
+                _writers[key] = writer
+            return writer
+
+    def submit(self, sql, params, missing_msg=None):
+        """Enfileira uma alteração. missing_msg é avisada se ela não afetar nenhuma linha."""
+        self._queue.put((sql, params, missing_msg))
+
+    def flush(self, timeout=None):
+        """Bloqueia até tudo que foi enfileirado antes desta chamada estar gravado."""
+        if not self.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout=10):
+        """Grava o que estiver pendente, faz o checkpoint do WAL e encerra a thread."""
+        if self.is_alive():
+            self._queue.put(None)
+            self.join(timeout)
+
+    def run(self):
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            # Junta o que já estiver na fila num único lote
+            batch, markers = [], []
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if not running or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            for marker in markers:
+                marker.set()
+
+        try:
+            # Encerramento durável: leva o WAL para o arquivo principal
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            self._conn.close()
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        try:
+            with self._conn:
+                results = [self._conn.execute(sql, params).rowcount for sql, params, _ in batch]
+        except Exception as e:
+            # Um item inválido não pode derrubar o lote inteiro: regrava um a um
+            print(f"[-] Erro ao gravar lote do registro ({len(batch)} itens): {e}. Regravando individualmente.")
+            results = []
+            for sql, params, _ in batch:
+                try:
+                    with self._conn:
+                        results.append(self._conn.execute(sql, params).rowcount)
+                except Exception as item_error:
+                    print(f"[-] Erro ao gravar no registro: {item_error}")
+                    results.append(None)
+
+        for (_, _, missing_msg), rowcount in zip(batch, results):
+            if rowcount == 0 and missing_msg:
+                print(missing_msg)
+
+def _stop_writers():
+    """Flush durável de todos os gravadores na saída do processo."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.stop()
+
+atexit.register(_stop_writers)
+
 class AccountRegistry:
     """
-    [Copiloto] Gerencia o registro de contas prontas para uso/venda em formato JSON.
+    [Copiloto] Gerencia o registro de contas prontas para uso/venda em SQLite (modo WAL).
     Centraliza o status de maturação e metadados das contas criadas.
+    Na primeira execução importa o antigo database/accounts.json (uma única vez).
+    Com write_behind, register_account/update_status só enfileiram a alteração
+    para o RegistryWriter e retornam na hora.
     """
-    def __init__(self, file_path="database/accounts.json"):
-        self.file_path = file_path
-        # [BOA PRÁTICA] Garante a existência da estrutura de pastas e arquivo
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        if not os.path.exists(self.file_path):
-            with open(self.file_path, 'w') as f:
-                json.dump([], f)
 
-    def register_account(self, nickname, instance_id, status="Pronta"):
-        """Adiciona uma conta recém-criada ao registro inicial."""
-        data = {
-            "nickname": nickname,
-            "instance_origin": instance_id,
-            "status": status,
-            "data_criacao": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "maturada": False # Inicia como False até completar o ciclo de slot
-        }
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nickname TEXT,
+            instance_origin INTEGER,
+            status TEXT,
+            data_criacao TEXT,
+            maturada INTEGER NOT NULL DEFAULT 0,
+            data_maturacao TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_accounts_instance ON accounts (instance_origin);
+        CREATE INDEX IF NOT EXISTS idx_accounts_status ON accounts (status);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    UPDATE_SQL = """
+        UPDATE accounts SET status = ?,
+            maturada = CASE WHEN ? THEN 1 ELSE maturada END,
+            data_maturacao = CASE WHEN ? THEN ? ELSE data_maturacao END
+        WHERE id = (SELECT id FROM accounts WHERE instance_origin = ? ORDER BY id DESC LIMIT 1)
+    """
+
+    def __init__(self, db_path="database/accounts.db", json_path="database/accounts.json",
+                 write_behind=True, batch_size=100, flush_interval=0.5):
+        self.db_path = db_path
+        # [BOA PRÁTICA] Garante a existência da estrutura de pastas
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        # Uma conexão por registro, protegida por lock (threads da mesma instância)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+
+        self.import_json(json_path)
+
+        self.writer = RegistryWriter.shared(db_path, batch_size, flush_interval) if write_behind else None
+
+    @staticmethod
+    def _now():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def import_json(self, json_path):
+        """
+        Importa as contas do antigo registro JSON. Roda uma única vez por banco
+        (marcado na tabela meta); chamadas seguintes não fazem nada.
+        :return: Quantidade de contas importadas.
+        """
+        if not json_path or not os.path.exists(json_path):
+            return 0
 
         try:
-            with open(self.file_path, 'r+') as f:
-                accounts = json.load(f)
-                accounts.append(data)
-                f.seek(0)
-                json.dump(accounts, f, indent=4)
-                f.truncate() # Garante que o arquivo seja limpo após o novo dump
+            with self._lock, self._conn:
+                # BEGIN IMMEDIATE: dois processos não importam o mesmo arquivo ao mesmo tempo
+                self._conn.execute("BEGIN IMMEDIATE")
+                if self._conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+                    return 0
+
+                with open(json_path, 'r') as f:
+                    accounts = json.load(f)
+
+                rows = [(
+                    acc.get("nickname"),
+                    acc.get("instance_origin"),
+                    acc.get("status"),
+                    acc.get("data_criacao"),
+                    int(bool(acc.get("maturada", False))),
+                    acc.get("data_maturacao")
+                ) for acc in accounts]
+                self._conn.executemany(
+                    "INSERT INTO accounts (nickname, instance_origin, status, data_criacao, maturada, data_maturacao) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('json_imported', ?)",
+                    (f"{json_path} ({len(rows)} contas) em {self._now()}",)
+                )
+            if rows:
+                print(f"[*] {len(rows)} contas importadas de {json_path} para {self.db_path}.")
+            return len(rows)
+        except Exception as e:
+            print(f"[-] Erro ao importar registro JSON: {e}")
+            return 0
+
+    def _write(self, sql, params, missing_msg=None):
+        """Grava direto ou, com write-behind, enfileira para o RegistryWriter."""
+        if self.writer is not None:
+            self.writer.submit(sql, params, missing_msg)
             return True
+        with self._lock, self._conn:
+            rowcount = self._conn.execute(sql, params).rowcount
+        if rowcount == 0 and missing_msg:
+            print(missing_msg)
+            return False
+        return True
+
+    def _has_account(self, instance_id):
+        """Indica se existe conta da instância, contando as inserções ainda na fila."""
+        query = "SELECT 1 FROM accounts WHERE instance_origin = ? LIMIT 1"
+        with self._lock:
+            if self._conn.execute(query, (instance_id,)).fetchone():
+                return True
+        # Só espera a fila quando a conta ainda não está no banco
+        self.flush()
+        with self._lock:
+            return self._conn.execute(query, (instance_id,)).fetchone() is not None
+
+    def register_account(self, nickname, instance_id, status="Pronta"):
+        """Adiciona uma conta recém-criada ao registro inicial."""
+        try:
+            # maturada inicia como False até completar o ciclo de slot
+            return self._write(
+                "INSERT INTO accounts (nickname, instance_origin, status, data_criacao, maturada) "
+                "VALUES (?, ?, ?, ?, 0)",
+                (nickname, instance_id, status, self._now())
+            )
         except Exception as e:
             print(f"[-] Erro ao registrar conta: {e}")
             return False
@@ -41,43 +261,45 @@ class AccountRegistry:
         """
         [NOVO] Localiza a conta pela instância de origem e atualiza seu status.
         Essencial para o Step 6: Finalização Limpa.
+        Com instâncias recicladas, atualiza a conta mais recente daquela instância.
         """
-        updated = False
+        # Se o status for MATURADA_COMPLETA, marca a flag definitiva
+        matured = new_status == "MATURADA_COMPLETA"
+        missing_msg = f"[!] Conta na instância {instance_id} não encontrada para atualização."
         try:
-            with open(self.file_path, 'r+') as f:
-                accounts = json.load(f)
-                
-                for account in accounts:
-                    # Busca pela instância que está rodando o processo
-                    if account.get("instance_origin") == instance_id:
-                        account["status"] = new_status
-                        # Se o status for MATURADA_COMPLETA, marca a flag definitiva
-                        if new_status == "MATURADA_COMPLETA":
-                            account["maturada"] = True
-                            account["data_maturacao"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        updated = True
-                        break
-                
-                if updated:
-                    f.seek(0)
-                    json.dump(accounts, f, indent=4)
-                    f.truncate()
-                    return True
-                
-            print(f"[!] Conta na instância {instance_id} não encontrada para atualização.")
-            return False
+            # Com write-behind, confirma a conta antes de enfileirar (o retorno continua valendo)
+            if self.writer is not None and not self._has_account(instance_id):
+                print(missing_msg)
+                return False
+            return self._write(
+                self.UPDATE_SQL,
+                (new_status, matured, matured, self._now(), instance_id),
+                missing_msg=missing_msg
+            )
         except Exception as e:
-            print(f"[-] Erro ao atualizar status no JSON: {e}")
+            print(f"[-] Erro ao atualizar status no registro: {e}")
             return False
 
     def get_account_status(self, instance_id):
         """Retorna o status atual de uma conta vinculada a uma instância."""
+        # Lê o que a própria aplicação já escreveu (inclui o que estava na fila)
+        self.flush()
         try:
-            with open(self.file_path, 'r') as f:
-                accounts = json.load(f)
-                for acc in accounts:
-                    if acc.get("instance_origin") == instance_id:
-                        return acc.get("status")
-        except:
-            pass
-        return None
\ No newline at end of file
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT status FROM accounts WHERE instance_origin = ? ORDER BY id DESC LIMIT 1",
+                    (instance_id,)
+                ).fetchone()
+            return row["status"] if row else None
+        except Exception:
+            return None
+
+    def flush(self, timeout=None):
+        """Aguarda a gravação das alterações enfileiradas (no-op sem write-behind)."""
+        if self.writer is not None:
+            return self.writer.flush(timeout)
+        return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
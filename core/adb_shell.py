@@ -0,0 +1,169 @@
+import subprocess
+import threading
+import time
+import uuid
+
+class _ShellTimeout(Exception):
+    """Comando sem resposta no prazo (não é falha do canal: não deve ser reenviado)."""
+
+class AdbShellSession:
+    """
+    Canal de shell ADB persistente para uma instância do MEmu.
+    Mantém um único processo 'memuc adb -i N shell' vivo e escreve os comandos
+    no stdin dele, lendo a saída até um marcador de fim. Evita um spawn de
+    processo por tap/keyevent.
+    """
+
+    # Código de retorno devolvido em timeout (mesma convenção do 'timeout' do coreutils)
+    TIMEOUT_RETURNCODE = 124
+
+    def __init__(self, memuc_path, instance_id, log=None):
+        self.memuc_path = memuc_path
+        self.instance_id = instance_id
+        self.log = log
+
+        self._process = None
+        self._reader = None
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        # Serializa os comandos: um canal atende uma thread por vez
+        self._cmd_lock = threading.Lock()
+
+    # --- CICLO DE VIDA DO CANAL ---
+
+    def is_alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def _connect(self):
+        """Abre (ou reabre) o processo de shell persistente."""
+        self.close()
+        command = [self.memuc_path, 'adb', '-i', str(self.instance_id), 'shell']
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            shell=False
+        )
+        with self._cond:
+            self._buffer.clear()
+        self._reader = threading.Thread(target=self._read_loop, args=(self._process,), daemon=True)
+        self._reader.start()
+        if self.log:
+            self.log.info(f"Canal ADB persistente aberto para a instância {self.instance_id}.")
+
+    def _read_loop(self, process):
+        """Thread leitora: acumula o stdout do shell no buffer compartilhado."""
+        stream = process.stdout
+        while True:
+            try:
+                chunk = stream.read1(65536) if hasattr(stream, 'read1') else stream.read(4096)
+            except Exception:
+                chunk = b''
+            with self._cond:
+                if chunk:
+                    self._buffer.extend(chunk)
+                self._cond.notify_all()
+            if not chunk:
+                break
+
+    def close(self):
+        """Encerra o processo de shell (a próxima chamada reconecta)."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.close()
+                process.kill()
+            process.wait(timeout=2)
+        except Exception:
+            pass
+
+    # --- EXECUÇÃO ---
+
+    def execute(self, command, timeout=30):
+        """
+        Executa um comando no shell persistente.
+        :return: Tupla (saida, codigo_retorno) ou None se o canal falhar.
+                 Em timeout devolve ('', TIMEOUT_RETURNCODE): o comando já foi
+                 entregue e não é reenviado (evita taps/swipes duplicados).
+        """
+        with self._cmd_lock:
+            # Uma tentativa extra cobre o caso da instância ter sido reiniciada
+            for attempt in range(2):
+                try:
+                    if not self.is_alive():
+                        self._connect()
+                    return self._run(command, timeout)
+                except _ShellTimeout:
+                    if self.log:
+                        self.log.error(f"Timeout no canal ADB ({timeout}s): {command}")
+                    # O comando pode seguir rodando e poluir a próxima leitura
+                    self.close()
+                    return "", self.TIMEOUT_RETURNCODE
+                except (OSError, ValueError, subprocess.SubprocessError) as e:
+                    if self.log:
+                        self.log.warning(f"Canal ADB da instância {self.instance_id} caiu ({e}). Reconectando...")
+                    self.close()
+            return None
+
+    def _run(self, command, timeout):
+        token = uuid.uuid4().hex[:12]
+        # O marcador é escrito partido ("" no meio) para que um eventual eco do
+        # comando pelo terminal não seja confundido com a saída real
+        marker = f"__END_{token}__".encode()
+        line = f'{{ {command} ; }} 2>&1; echo "__END_""{token}__:$?"\n'
+
+        with self._cond:
+            self._buffer.clear()
+        self._process.stdin.write(line.encode('utf-8'))
+        self._process.stdin.flush()
+
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                idx = self._buffer.find(marker)
+                if idx != -1:
+                    end = self._buffer.find(b'\n', idx)
+                    if end != -1:
+                        break
+                if not self.is_alive():
+                    raise OSError("processo de shell encerrado")
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise _ShellTimeout(command)
+                self._cond.wait(min(remaining, 0.5))
+
+            output = bytes(self._buffer[:idx])
+            status_raw = bytes(self._buffer[idx + len(marker) + 1:end])
+            del self._buffer[:end + 1]
+
+        try:
+            returncode = int(status_raw.strip() or 0)
+        except ValueError:
+            returncode = 0
+        text = output.decode('utf-8', errors='ignore').replace('\r', '')
+        return text, returncode
+
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+def get_shell_session(memuc_path, instance_id, log=None):
+    """Retorna o canal persistente da instância, compartilhado entre threads."""
+    key = (memuc_path, str(instance_id))
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = AdbShellSession(memuc_path, instance_id, log)
+            _SESSIONS[key] = session
+        return session
+
+def reset_shell_session(memuc_path, instance_id):
+    """Derruba o canal da instância (ex: após stop/start do emulador)."""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.pop((memuc_path, str(instance_id)), None)
+    if session:
+        session.close()
@@ -1,27 +1,43 @@
-from actions.image_recognition import ImageRecognition
-from actions.ocr_manager import OCRManager
+from core.instance_context import InstanceContext
+import cv2
+import numpy as np
 import time
 
 class BlockHandler:
     def __init__(self, emulator_manager, instance_id=0):
-        self.emu = emulator_manager
-        self.instance_id = instance_id
-        self.log = emulator_manager.log
-        self.img_rec = ImageRecognition(self.emu, self.instance_id)
-        self.ocr = OCRManager(self.emu, self.instance_id)
+        self.ctx = InstanceContext.of(emulator_manager, instance_id)
+        self.emu = self.ctx.emu
+        self.instance_id = self.ctx.instance_id
+        self.log = self.ctx.log
+        self.img_rec = self.ctx.vision
+        self.ocr = self.ctx.ocr
+
+        cfg = self.emu.config.settings.get('block_detection', {})
+        self.min_edge_ratio = cfg.get('min_edge_ratio', 0.005)
+        self.dim_level = cfg.get('dim_level', 100)
 
     def is_account_blocked(self):
         """
         Verifica se a tela atual contém indícios de bloqueio.
+        Cascata sobre um único frame: template -> pistas de modal -> OCR.
+        O OCR só roda quando as pistas baratas indicam um aviso na tela.
         """
-        # 1. Busca por imagem (ex: ícone de cadeado ou exclamação vermelha)
+        frame = self.img_rec.capture_frame()
+        if frame is None:
+            return False
+
+        # 1. Busca por imagem (ex: ícone de cadeado ou exclamação vermelha) - reaproveita o frame em cache
         if self.img_rec.find_element("popup_bloqueio.png", threshold=0.9):
             self.log.error(f"Instância {self.instance_id}: Janela de bloqueio detectada por imagem.")
             return True
 
-        # 2. Busca por texto (OCR) - Palavras-chave de banimento
+        # 2. Pistas baratas: texto na região do aviso e restante da tela escurecido
+        if not self._has_dialog_cue(frame):
+            return False
+
+        # 3. Busca por texto (OCR) - Palavras-chave de banimento
         try:
-            texto_erro = self.ocr.get_text_from_region("aviso_bloqueio").lower()
+            texto_erro = self.ocr.get_text_from_region("aviso_bloqueio", frame=frame, psm=6).lower()
             palavras_chave = ["suspenso", "bloqueada", "banido", "restringida", "violacao", "blocked"]
             
             if any(palavra in texto_erro for palavra in palavras_chave):
@@ -32,6 +48,36 @@ class BlockHandler:
 
         return False
 
+    def _has_dialog_cue(self, frame):
+        """
+        Pista barata antes do OCR: há um aviso na região 'aviso_bloqueio'?
+        - a região precisa ter contornos de texto (tela lisa não tem o que ler), e
+        - o restante da tela precisa estar escuro: fundo escurecido por um modal
+          ou página de bloqueio em tela cheia. As telas do jogo são bem mais claras.
+        """
+        reg = self.emu.config.timings.get("ui_regions", {}).get("aviso_bloqueio")
+        if not reg:
+            return True # Sem região definida não há como filtrar: deixa o OCR decidir
+
+        x, y, w, h = reg['x'], reg['y'], reg['w'], reg['h']
+        crop = frame[y:y+h, x:x+w]
+        if crop.size == 0:
+            return False
+
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(gray, 50, 150)
+        if cv2.countNonZero(edges) / edges.size < self.min_edge_ratio:
+            return False
+
+        # Brilho (V do HSV) fora da região, amostrado a cada 4 pixels
+        step = 4
+        value = frame[::step, ::step].max(axis=2)
+        outside = np.ones(value.shape, dtype=bool)
+        outside[y // step:(y + h) // step, x // step:(x + w) // step] = False
+        if not outside.any():
+            return True # Região cobre a tela inteira: deixa o OCR decidir
+        return float(np.percentile(value[outside], 75)) < self.dim_level
+
     def handle_blocked_account(self):
         """
         Ação a ser tomada se bloqueado: Fecha, remove e marca no log.
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+from core.emulator_manager import EmulatorManager
+from core.instance_manager import InstanceManager
+from core.fleet_scheduler import HEAVY, get_phase_gate
+
+# Um pool por instância base, compartilhado pelo processo
+_pools = {}
+_pools_lock = threading.Lock()
+
+class ClonePool(threading.Thread):
+    """
+    Mantém em segundo plano 'size' clones da instância base prontos para uso
+    (já renomeados e, opcionalmente, já ligados). Entregar uma instância nova
+    vira só retirar da fila, enquanto o pool repõe o estoque.
+    Clones prontos ficam com o prefixo POOL_PREFIX no nome e são reaproveitados
+    na próxima execução do bot.
+    """
+
+    POOL_PREFIX = "Bot_Pool_"
+
+    def __init__(self, base_id=0, size=2, preboot=False, refill_interval=10):
+        super().__init__(name=f"ClonePool-{base_id}", daemon=True)
+        self.base_id = base_id
+        self.size = size
+        self.preboot = preboot
+        self.refill_interval = refill_interval
+
+        self.emu = EmulatorManager(instance_id=base_id)
+        self.log = self.emu.log
+        self.inst_manager = InstanceManager(self.emu)
+
+        self._ready = queue.Queue()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        # Já na criação: o primeiro acquire encontra as sobras no estoque
+        self._adopt_existing()
+
+    def ready_count(self):
+        return self._ready.qsize()
+
+    def _adopt_existing(self):
+        """Recoloca no estoque os clones do pool que sobraram da execução anterior."""
+        for inst in self.inst_manager.list_all_instances():
+            if inst["name"].startswith(self.POOL_PREFIX):
+                self._ready.put(int(inst["id"]))
+        if self._ready.qsize():
+            self.log.info(f"[♻️] {self._ready.qsize()} clone(s) do pool reaproveitado(s).")
+
+    def _make_clone(self):
+        new_id = self.inst_manager.create_new_account_instance(self.base_id)
+        if new_id is None:
+            return None
+        self.emu._execute_memuc(['rename', '-i', str(new_id), f"{self.POOL_PREFIX}{time.strftime('%d%m_%H%M%S')}"])
+
+        if self.preboot:
+            # Boot do pool disputa as mesmas vagas de fase pesada que os bots
+            with get_phase_gate(self.emu.config.settings).phase(new_id, "preboot", HEAVY):
+                if not EmulatorManager(instance_id=new_id).launch_instance():
+                    self.log.warning(f"[!] Clone {new_id} não ligou no pre-boot; será ligado pelo bot.")
+        return new_id
+
+    def run(self):
+        while not self._stop_event.is_set():
+            if self._ready.qsize() < self.size:
+                new_id = self._make_clone()
+                if new_id is not None:
+                    self._ready.put(new_id)
+                    self.log.info(f"[🧊] Clone {new_id} pronto no pool ({self._ready.qsize()}/{self.size}).")
+                    continue
+                # Falha na clonagem: espera antes de tentar de novo
+            self._wakeup.wait(self.refill_interval)
+            self._wakeup.clear()
+
+    def acquire(self, timeout=None):
+        """
+        Entrega o próximo clone pronto (renomeado como conta) e dispara a reposição.
+        :param timeout: Tempo máximo esperando o pool; esgotado, clona na hora.
+        :return: ID da instância ou None em caso de falha.
+        """
+        try:
+            new_id = self._ready.get(timeout=timeout) if timeout else self._ready.get_nowait()
+        except queue.Empty:
+            new_id = None
+        self._wakeup.set()
+
+        if new_id is None:
+            self.log.warning("[!] Pool de clones vazio. Clonando no caminho crítico...")
+            return self.inst_manager.create_new_account_instance(self.base_id)
+
+        self.emu._execute_memuc(['rename', '-i', str(new_id), f"Bot_Conta_{time.strftime('%d%m_%H%M')}"])
+        self.log.info(f"[✅] Instância {new_id} entregue pelo pool ({self._ready.qsize()} restante(s)).")
+        return new_id
+
+    def stop(self):
+        self._stop_event.set()
+        self._wakeup.set()
+
+def get_clone_pool(base_id=0, settings=None):
+    """Retorna o pool da instância base (criando e iniciando na primeira chamada)."""
+    with _pools_lock:
+        pool = _pools.get(base_id)
+        if pool is None or not pool.is_alive():
+            cfg = (settings or {}).get('clone_pool', {})
+            pool = ClonePool(
+                base_id=base_id,
+                size=cfg.get('size', 2),
+                preboot=cfg.get('preboot', False),
+                refill_interval=cfg.get('refill_interval_seconds', 10)
+            )
+            pool.start()
+            _pools[base_id] = pool
+        return pool
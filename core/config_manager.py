@@ -1,36 +1,136 @@
 import json
 import yaml
 import os
+import threading
+import time
+from types import MappingProxyType
 
-class ConfigManager:
-    def __init__(self):
-        self.config_path = "config"
-        self.settings = self.load_yaml("settings.yaml")
-        self.proxies = self.load_json("proxies.json")
-        self.accounts = self.load_json("accounts.json")
-        self.timings = self.load_json("timings.json")
+# Arquivos carregados pelo ConfigManager: atributo -> nome do arquivo em config/
+CONFIG_FILES = {
+    "settings": "settings.yaml",
+    "proxies": "proxies.json",
+    "accounts": "accounts.json",
+    "timings": "timings.json",
+}
 
-    def load_json(self, file_name):
-        path = os.path.join(self.config_path, file_name)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content: # Se o arquivo estiver totalmente em branco
-                    return {}
+# Um snapshot por diretório de configuração, compartilhado pelo processo inteiro
+_stores = {}
+_stores_lock = threading.Lock()
+
+def _freeze(value):
+    """Converte dicts/listas em estruturas somente leitura (snapshot imutável)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _read_file(path):
+    """Lê um arquivo YAML/JSON. Arquivo inexistente ou em branco vira {}; erro de sintaxe levanta."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if not content: # Se o arquivo estiver totalmente em branco
+        return {}
+    if path.endswith(('.yaml', '.yml')):
+        return yaml.safe_load(content) or {}
+    return json.loads(content)
+
+class _ConfigStore:
+    """
+    Snapshot dos arquivos de configuração. Cada arquivo só é relido quando o
+    seu mtime muda, e o stat é feito no máximo a cada 'check_interval' segundos.
+    """
+
+    def __init__(self, config_path, check_interval=2.0):
+        self.config_path = config_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtimes = {}
+        self._data = {key: MappingProxyType({}) for key in CONFIG_FILES}
+        self._next_check = 0.0
+        self.refresh(force=True)
+
+    def get(self, key):
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._data[key]
+
+    def refresh(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and now < self._next_check:
+                return # Outra thread acabou de verificar
+            self._next_check = now + self.check_interval
+
+            for key, file_name in CONFIG_FILES.items():
+                path = os.path.join(self.config_path, file_name)
                 try:
-                    import json
-                    return json.loads(content)
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if not force and mtime == self._mtimes.get(key):
+                    continue
+
+                try:
+                    self._data[key] = _freeze(_read_file(path))
+                    if not force:
+                        print(f"[*] Configuração recarregada: {file_name}")
                 except Exception as e:
+                    # Mantém o snapshot anterior; tenta de novo na próxima verificação
                     print(f"Erro ao ler {file_name}: {e}")
-                    return {}
-        return {}
+                    continue
+                self._mtimes[key] = mtime
+
+class ConfigManager:
+    """
+    Acesso à configuração (config/*.yaml|json).
+    Todas as instâncias do processo compartilham o mesmo snapshot imutável,
+    recarregado automaticamente quando algum arquivo é alterado em disco.
+    """
+
+    def __init__(self, config_path="config"):
+        self.config_path = config_path
+        key = os.path.abspath(config_path)
+        with _stores_lock:
+            if key not in _stores:
+                _stores[key] = _ConfigStore(config_path)
+            self._store = _stores[key]
+
+    @property
+    def settings(self):
+        return self._store.get("settings")
+
+    @property
+    def proxies(self):
+        return self._store.get("proxies")
+
+    @property
+    def accounts(self):
+        return self._store.get("accounts")
+
+    @property
+    def timings(self):
+        return self._store.get("timings")
+
+    def reload(self):
+        """Força a releitura de todos os arquivos."""
+        self._store.refresh(force=True)
+
+    def _load(self, file_name):
+        """Leitura direta do disco (fora do snapshot compartilhado)."""
+        try:
+            return _read_file(os.path.join(self.config_path, file_name))
+        except Exception as e:
+            print(f"Erro ao ler {file_name}: {e}")
+            return {}
+
+    def load_json(self, file_name):
+        return self._load(file_name)
 
     def load_yaml(self, file_name):
-        path = os.path.join(self.config_path, file_name)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        return {}
+        return self._load(file_name)
 
     def get_proxy_for_instance(self, instance_id):
         """Retorna o proxy configurado para uma instância específica [cite: 10, 134]"""
@@ -39,7 +139,7 @@ class ConfigManager:
     def get_timing(self, key, default=1.5):
         """Retorna tempos de espera configurados [cite: 49, 132]"""
         return self.timings.get(key, default)
-    
+
     def get_ui_point(self, point_name):
         """Retorna um dicionário {'x': val, 'y': val} para o ponto solicitado"""
         ui_points = self.timings.get("ui_points", {})
@@ -47,4 +147,4 @@ class ConfigManager:
         if not point:
             print(f"[!] Aviso: Ponto de UI '{point_name}' não encontrado no JSON.")
             return {"x": 0, "y": 0}
-        return point
\ No newline at end of file
+        return point
@@ -1,8 +1,11 @@
 import subprocess
 import os
+import threading
 import time
 from core.config_manager import ConfigManager
 from core.log_manager import LogManager
+from core.adb_shell import get_shell_session, reset_shell_session
+from core.ui_utils import UIUtils
 
 class EmulatorManager:
     """
@@ -11,20 +14,54 @@ class EmulatorManager:
     Verificação de saúde via ADB.
     """
 
+    # Instâncias dentro do launch_instance (todas as threads do processo)
+    _booting = set()
+    _booting_lock = threading.Lock()
+
+    @classmethod
+    def booting_instances(cls):
+        with cls._booting_lock:
+            return set(cls._booting)
+
     def __init__(self, instance_id=0):
         self.config = ConfigManager()
         self.instance_id = instance_id
-        self.log = LogManager(instance_id)
+        self.log = LogManager(instance_id, self.config.settings.get('logging', {}))
         
         # [AJUSTE] Busca o caminho e garante que as barras sejam tratadas corretamente
         path_raw = self.config.settings.get('emulator', {}).get('path', 'memuc.exe')
         self.memuc_path = os.path.normpath(path_raw)
+        # Canal ADB persistente (um processo de shell por instância)
+        self.persistent_shell = self.config.settings.get('emulator', {}).get('persistent_shell', True)
+        # Resolução e escalas em cache (invalidados quando a instância reinicia)
+        self._resolution = None
+        self._ui_utils = {}
         self.log.info(f"EmulatorManager inicializado: {self.memuc_path}")
 
     def _execute_memuc(self, args):
         """
         Executa comandos no CLI do MEmu usando lista de argumentos.
         Blindado contra espaços no caminho do diretório (Ex: Program Files).
+        Comandos 'adb -i N shell ...' são enviados ao canal persistente da instância.
+        """
+        if self.persistent_shell and len(args) > 4 and args[0] == 'adb' and args[1] == '-i' and args[3] == 'shell':
+            output = self._execute_shell(args[2], args[4:])
+            if output is not False:
+                return output
+
+        # Start/stop/remove invalidam o canal persistente da instância
+        if args and args[0] in ('start', 'stop', 'reboot', 'remove') and '-i' in args:
+            target_id = args[args.index('-i') + 1]
+            reset_shell_session(self.memuc_path, target_id)
+            if str(target_id) == str(self.instance_id):
+                self._resolution = None
+                self._ui_utils.clear()
+        return self._run_memuc(args)
+
+    def _run_memuc(self, args, quiet=False):
+        """
+        Executa o memuc num subprocesso próprio (sem passar pelo canal persistente).
+        :param quiet: Não registra o erro de retorno (sondas que falham de propósito, ex: boot).
         """
         # Monta o comando como uma lista: [executável, arg1, arg2...]
         command = [self.memuc_path] + args
@@ -45,7 +82,8 @@ class EmulatorManager:
             if process.returncode == 0:
                 return stdout.strip()
             else:
-                self.log.error(f"Falha memuc {args}: {stderr or stdout}")
+                if not quiet:
+                    self.log.error(f"Falha memuc {args}: {stderr or stdout}")
                 return None
         except FileNotFoundError:
             self.log.error(f"Executável não encontrado: {self.memuc_path}")
@@ -54,13 +92,48 @@ class EmulatorManager:
             self.log.error(f"Erro inesperado no subprocesso: {e}")
             return None
 
+    def _execute_shell(self, instance_id, shell_args, timeout=30):
+        """
+        Executa um comando no shell persistente da instância.
+        Retorna o mesmo contrato do _execute_memuc (stdout ou None) e
+        False quando o canal não está disponível (o chamador usa o subprocesso).
+        """
+        # 'adb shell a b c' junta os argumentos com espaço; mantemos a mesma semântica
+        command = ' '.join(str(a) for a in shell_args)
+        session = get_shell_session(self.memuc_path, instance_id, self.log)
+        result = session.execute(command, timeout=timeout)
+        if result is None:
+            return False
+
+        output, returncode = result
+        if returncode == 0:
+            return output.strip()
+        self.log.error(f"Falha shell [{instance_id}] '{command}': {output.strip()}")
+        return None
+
+    def shell(self, command, timeout=30):
+        """
+        Executa uma linha de comando no shell Android da instância atual.
+        :param timeout: Limite no canal persistente (comandos longos, ex: sequências com pausas).
+        """
+        if self.persistent_shell:
+            output = self._execute_shell(str(self.instance_id), [command], timeout=timeout)
+            if output is not False:
+                return output
+            # Canal indisponível: subprocesso direto, sem voltar ao canal pelo _execute_memuc
+        return self._run_memuc(['adb', '-i', str(self.instance_id), 'shell', command])
+
     # --- NOVO: MÉTODOS REQUISITADOS PELAS AÇÕES ---
 
-    def get_screen_resolution(self):
+    def get_screen_resolution(self, refresh=False):
         """
         Detecta a resolução da instância via ADB para normalizar cliques.
-        Essencial para o ClickActions.py.
+        Essencial para o ClickActions.py. O valor fica em cache até a instância
+        ser reiniciada (start/stop) ou até refresh=True.
         """
+        if self._resolution and not refresh:
+            return self._resolution
+
         # Adicionamos -i <id> para garantir que pegamos a resolução da instância correta
         cmd = ['adb', '-i', str(self.instance_id), 'shell', 'wm', 'size']
         output = self._execute_memuc(cmd)
@@ -73,10 +146,28 @@ class EmulatorManager:
             res_line = [l for l in output.splitlines() if "size:" in l][0]
             res_str = res_line.split(": ")[1].strip()
             w, h = map(int, res_str.split('x'))
+            # Só guarda leituras válidas; o padrão 1280x720 é tentado de novo na próxima chamada
+            self._resolution = (w, h)
             return w, h
         except Exception:
             return 1280, 720
 
+    def get_ui_utils(self, base_res=(1280, 720)):
+        """
+        Retorna o UIUtils (escala base -> real) da instância, calculado uma vez.
+        Escalas montadas sobre o padrão 1280x720 (sem leitura do 'wm size', ex: antes
+        do boot) não entram no cache: a próxima chamada tenta ler de novo.
+        """
+        base_res = tuple(base_res)
+        utils = self._ui_utils.get(base_res)
+        if utils is None:
+            curr_w, curr_h = self.get_screen_resolution()
+            utils = UIUtils(current_width=curr_w, current_height=curr_h,
+                            base_width=base_res[0], base_height=base_res[1])
+            if self._resolution:
+                self._ui_utils[base_res] = utils
+        return utils
+
     def take_screenshot(self, save_path):
         """
         Captura a tela da instância e salva no caminho especificado.
@@ -85,34 +176,122 @@ class EmulatorManager:
         # Comando nativo do memuc para screenshot é mais rápido que ADB
         return self._execute_memuc(['screencap', '-i', str(self.instance_id), save_path])
 
+    def capture_raw_screen(self, timeout=10):
+        """
+        Captura o framebuffer cru da instância via 'adb exec-out screencap'.
+        Sem PNG e sem arquivo temporário: os bytes vêm direto pelo stdout.
+        :return: bytes (cabeçalho + pixels RGBA) ou None em caso de falha.
+        """
+        command = [self.memuc_path, 'adb', '-i', str(self.instance_id), 'exec-out', 'screencap']
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False)
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            self.log.error(f"Timeout na captura em memória da instância {self.instance_id}.")
+            return None
+        except FileNotFoundError:
+            self.log.error(f"Executável não encontrado: {self.memuc_path}")
+            return None
+        except Exception as e:
+            self.log.error(f"Erro inesperado na captura em memória: {e}")
+            return None
+
+        if process.returncode != 0 or not stdout:
+            self.log.error(f"Falha screencap em memória: {stderr.decode('utf-8', errors='ignore').strip()}")
+            return None
+        return stdout
+
     # --- GERENCIAMENTO DE ESTADO ---
 
     def is_running(self):
         """Verifica se a instância específica está ativa."""
-        output = self._execute_memuc(['isrunning', '-i', str(self.instance_id)])
-        return "Running" in str(output)
+        output = str(self._execute_memuc(['isrunning', '-i', str(self.instance_id)]))
+        # A saída para instância desligada é "Not Running"
+        return "Running" in output and "Not Running" not in output
+
+    def boot_status(self, direct=False):
+        """
+        Sonda de prontidão do Android em um único round-trip:
+        boot concluído, package manager respondendo e launcher resolvido.
+        :param direct: Um subprocesso silencioso por sonda, sem o canal persistente
+                       (enquanto o adbd ainda não subiu, o canal só reconectaria e logaria).
+        :return: Dict {'boot', 'pm', 'launcher'} (bool cada).
+        """
+        command = (
+            'echo "boot=$(getprop sys.boot_completed)"; '
+            'echo "pm=$(pm path android 2>/dev/null | head -n 1)"; '
+            'echo "home=$(cmd package resolve-activity --brief -a android.intent.action.MAIN '
+            '-c android.intent.category.HOME 2>/dev/null | tail -n 1)"; '
+            'echo "focus=$(dumpsys window windows 2>/dev/null | grep -m 1 mCurrentFocus)"'
+        )
+        if direct:
+            output = self._run_memuc(['adb', '-i', str(self.instance_id), 'shell', command], quiet=True)
+        else:
+            output = self.shell(command)
+        values = {}
+        for line in (output or "").splitlines():
+            key, _, value = line.partition("=")
+            values[key.strip()] = value.strip()
+
+        return {
+            "boot": values.get("boot") == "1",
+            "pm": values.get("pm", "").startswith("package:"),
+            # Android sem 'cmd package resolve-activity': aceita o launcher já em foco
+            "launcher": "/" in values.get("home", "") or "launcher" in values.get("focus", "").lower(),
+        }
+
+    def is_boot_ready(self, direct=False):
+        """True quando o Android está pronto para abrir apps."""
+        return all(self.boot_status(direct).values())
 
     def launch_instance(self, timeout=120):
-        """Liga o emulador e aguarda o ADB estar pronto."""
-        if self.is_running():
+        """
+        Liga o emulador e aguarda o Android estar pronto (boot, package manager e launcher).
+        Instância já ligada, mas ainda não pronta (ex: pre-boot do pool que falhou), também é aguardada.
+        """
+        running = self.is_running()
+        if running and self.is_boot_ready(direct=True):
             self.log.info(f"[!] Instância {self.instance_id} já está rodando.")
             return True
 
-        self.log.info(f"[*] Iniciando Instância {self.instance_id} (Aguardando Boot)...")
-        self._execute_memuc(['start', '-i', str(self.instance_id)])
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            check = self._execute_memuc(['adb', '-i', str(self.instance_id), 'shell', 'echo', 'ready'])
-            if check and "ready" in check:
-                self.log.info(f"✅ Instância {self.instance_id} pronta!")
-                time.sleep(3) 
-                return True
-            time.sleep(5)
-            self.log.info(f"  - Boot em curso ({int(time.time() - start_time)}s)...")
-
-        self.log.error(f"❌ Timeout ao iniciar instância {self.instance_id}.")
-        return False
+        poll = self.config.settings.get('emulator', {}).get('boot_poll_interval', 1.0)
+        with EmulatorManager._booting_lock:
+            EmulatorManager._booting.add(self.instance_id)
+        try:
+            if running:
+                self.log.info(f"[*] Instância {self.instance_id} já ligada, aguardando o Android ficar pronto...")
+            else:
+                self.log.info(f"[*] Iniciando Instância {self.instance_id} (Aguardando Boot)...")
+                # O 'start' também derruba o canal ADB antigo (reconecta no primeiro comando)
+                self._execute_memuc(['start', '-i', str(self.instance_id)])
+
+            start_time = time.time()
+            last_report = start_time
+            status = {}
+            while time.time() - start_time < timeout:
+                # Até o boot concluir o adbd cai e volta: sonda por subprocesso direto
+                status = self.boot_status(direct=not status.get("boot"))
+                if all(status.values()):
+                    self.log.info(f"✅ Instância {self.instance_id} pronta em {time.time() - start_time:.1f}s!")
+                    return True
+                if time.time() - last_report >= 10:
+                    pending = [k for k, ok in status.items() if not ok]
+                    self.log.info(f"  - Boot em curso ({int(time.time() - start_time)}s), aguardando: {', '.join(pending)}...")
+                    last_report = time.time()
+                time.sleep(poll)
+
+            self.log.error(f"❌ Timeout ao iniciar instância {self.instance_id} (estado: {status}).")
+            return False
+        finally:
+            with EmulatorManager._booting_lock:
+                EmulatorManager._booting.discard(self.instance_id)
+
+    def stop_instance(self):
+        """Desliga a instância e fecha o canal ADB persistente."""
+        self.log.info(f"[*] Desligando Instância {self.instance_id}...")
+        return self._execute_memuc(['stop', '-i', str(self.instance_id)])
 
     def launch_app(self, package_name="com.playshoo.texaspoker.romania"):
         """Lança o app de Poker de forma forçada."""
@@ -123,9 +302,16 @@ class EmulatorManager:
         cmd = ['adb', '-i', str(self.instance_id), 'shell', 'monkey', '-p', package_name, '1']
         self._execute_memuc(cmd)
         
-        time.sleep(5)
+        # Retorna assim que o app estiver em primeiro plano (máx. 5s, como antes)
+        from actions.wait_conditions import wait_until, Predicate
+        wait_until(Predicate(lambda: self.is_app_foreground(package_name)), timeout=5, interval=0.5)
         return True
 
+    def is_app_foreground(self, package_name):
+        """Verifica se o pacote é a janela em foco na instância."""
+        output = self.shell("dumpsys window windows | grep -E 'mCurrentFocus|mFocusedApp'; true")
+        return bool(output) and package_name in output
+
     def stop_app(self, package_name):
         """Encerra o app."""
         return self._execute_memuc(['adb', '-i', str(self.instance_id), 'shell', 'am', 'force-stop', package_name])
@@ -164,4 +350,26 @@ class EmulatorManager:
                     })
                 except (ValueError, IndexError):
                     continue
-        return instances
\ No newline at end of file
+        return instances
+
+def boot_instances(instance_ids, timeout=120, max_parallel=None):
+    """
+    Liga várias instâncias em paralelo e devolve cada uma assim que fica pronta.
+    Cada boot é uma fase HEAVY (respeita scheduler.max_heavy_phases).
+    :return: Gerador de (EmulatorManager, pronta) na ordem em que os boots terminam.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from core.fleet_scheduler import HEAVY, get_phase_gate
+
+    def boot(instance_id):
+        emu = EmulatorManager(instance_id=instance_id)
+        with get_phase_gate(emu.config.settings).phase(instance_id, "boot", HEAVY, log=emu.log):
+            return emu, emu.launch_instance(timeout=timeout)
+
+    instance_ids = list(instance_ids)
+    if not instance_ids:
+        return
+    with ThreadPoolExecutor(max_workers=max_parallel or len(instance_ids), thread_name_prefix="Boot") as pool:
+        futures = [pool.submit(boot, i) for i in instance_ids]
+        for future in as_completed(futures):
+            yield future.result()
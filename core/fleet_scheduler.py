@@ -0,0 +1,202 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from core.config_manager import ConfigManager
+from core.emulator_manager import EmulatorManager
+
+# Classes de custo das etapas do fluxo de uma instância
+HEAVY = "HEAVY" # Picos de CPU/disco: boot do emulador, abertura do app, login
+LIGHT = "LIGHT" # Maior parte do tempo esperando: mesa, slot, maturação
+
+_phase_gate = None
+_phase_gate_lock = threading.Lock()
+
+def host_usage():
+    """
+    Uso atual do host em % (cpu, ram), ou None se o psutil não estiver instalado.
+    A CPU é medida desde a chamada anterior (sem bloquear).
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+class FleetScheduler:
+    """
+    Escalonador da frota: fila de trabalhos (um por instância) executada por um
+    pool limitado de workers. Cada novo trabalho só é admitido quando há worker
+    livre, poucas instâncias em boot e CPU/RAM do host abaixo dos limites.
+    """
+
+    def __init__(self, job, settings=None, max_workers=None):
+        """
+        :param job: Função job(instance_id) executada em uma thread do pool.
+        :param settings: settings.yaml (seção 'scheduler'); padrão: ConfigManager.
+        """
+        settings = settings if settings is not None else ConfigManager().settings
+        cfg = settings.get('scheduler', {})
+
+        self.job = job
+        self.max_workers = max_workers or cfg.get('max_workers') or settings.get('emulator', {}).get('instances_limit', 4)
+        self.max_booting = cfg.get('max_concurrent_boots', 2)
+        self.max_cpu = cfg.get('max_cpu_percent', 85)
+        self.max_ram = cfg.get('max_ram_percent', 85)
+        # Um trabalho recém-iniciado conta como boot até chegar ao launch_instance
+        self.boot_settle = cfg.get('boot_settle_seconds', 15)
+        self.admission_interval = cfg.get('admission_interval_seconds', 2)
+        self.phases = get_phase_gate(settings)
+
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self._recent_starts = {} # instance_id -> início do trabalho
+        self._workers = []
+        self.results = {}
+
+        # Primeira leitura de CPU só serve de referência
+        if host_usage() is None:
+            print("[!] psutil não instalado: admissão controlada apenas por workers e boots simultâneos.")
+
+    def submit(self, instance_id):
+        """Enfileira o trabalho de uma instância."""
+        self._queue.put(instance_id)
+
+    def booting_count(self):
+        """Instâncias em boot: dentro do launch_instance ou iniciadas há pouco."""
+        now = time.time()
+        with self._lock:
+            recent = {i for i, started in self._recent_starts.items() if now - started < self.boot_settle}
+        return len(recent | EmulatorManager.booting_instances())
+
+    def _admission_block(self):
+        """Motivo para segurar o próximo boot, ou None se pode admitir."""
+        booting = self.booting_count()
+        if booting >= self.max_booting:
+            return f"{booting} instância(s) em boot"
+
+        # Todo trabalho começa por um boot (HEAVY): não ocupa worker se não há vaga
+        heavy = self.phases.heavy_count()
+        if heavy >= self.phases.max_heavy:
+            return f"{heavy} instância(s) em fase pesada"
+
+        usage = host_usage()
+        if usage:
+            cpu, ram = usage
+            if cpu >= self.max_cpu:
+                return f"CPU em {cpu:.0f}%"
+            if ram >= self.max_ram:
+                return f"RAM em {ram:.0f}%"
+        return None
+
+    def _wait_admission(self):
+        last_reason = None
+        while True:
+            reason = self._admission_block()
+            if reason is None:
+                return
+            if reason != last_reason:
+                print(f"[⏳] Aguardando recursos para o próximo boot: {reason}.")
+                last_reason = reason
+            time.sleep(self.admission_interval)
+
+    def _worker(self, instance_id):
+        try:
+            self.results[instance_id] = self.job(instance_id)
+        except Exception as e:
+            print(f"❌ Erro crítico na execução da instância {instance_id}: {e}")
+            self.results[instance_id] = "ERROR"
+        finally:
+            with self._lock:
+                self._recent_starts.pop(instance_id, None)
+            self._slots.release()
+
+    def run(self, instance_ids=None):
+        """
+        Executa a fila (mais as instâncias passadas) até o fim.
+        :return: Dict instance_id -> retorno do job.
+        """
+        for instance_id in instance_ids or []:
+            self.submit(instance_id)
+
+        print(f"\n[🔥] Escalonando {self._queue.qsize()} instância(s) | até {self.max_workers} simultâneas, {self.max_booting} em boot.")
+        while True:
+            try:
+                instance_id = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self._slots.acquire() # Espera um worker livre
+            self._wait_admission()
+
+            with self._lock:
+                self._recent_starts[instance_id] = time.time()
+            t = threading.Thread(target=self._worker, args=(instance_id,), name=f"Fleet-{instance_id}", daemon=True)
+            self._workers.append(t)
+            t.start()
+            print(f"📡 Instância {instance_id} admitida ({self._queue.qsize()} na fila).")
+
+        for t in self._workers:
+            t.join()
+        return self.results
+
+
+class PhaseGate:
+    """
+    Controle de admissão por fase: no máximo 'max_heavy' instâncias ficam numa
+    fase HEAVY ao mesmo tempo; fases LIGHT nunca esperam.
+    Reentrante por instância (uma fase pesada dentro de outra não conta duas vezes).
+    """
+
+    def __init__(self, max_heavy=2):
+        self.max_heavy = max_heavy
+        self._cond = threading.Condition()
+        self._heavy = {} # instance_id -> profundidade de fases pesadas abertas
+        self._current = {} # instance_id -> (fase, custo, início)
+
+    def heavy_count(self):
+        with self._cond:
+            return len(self._heavy)
+
+    def get_phase(self, instance_id):
+        """Fase atual da instância: (nome, custo, início) ou None."""
+        with self._cond:
+            return self._current.get(instance_id)
+
+    @contextmanager
+    def phase(self, instance_id, name, cost=LIGHT, log=None):
+        """Executa o bloco dentro da fase; em HEAVY espera uma vaga antes de entrar."""
+        with self._cond:
+            previous = self._current.get(instance_id)
+            if cost == HEAVY and instance_id not in self._heavy:
+                if len(self._heavy) >= self.max_heavy and log:
+                    log.info(f"[⏳] Fase '{name}' aguardando vaga ({len(self._heavy)}/{self.max_heavy} instâncias em fase pesada).")
+                self._cond.wait_for(lambda: len(self._heavy) < self.max_heavy)
+            if cost == HEAVY:
+                self._heavy[instance_id] = self._heavy.get(instance_id, 0) + 1
+            self._current[instance_id] = (name, cost, time.time())
+        try:
+            yield
+        finally:
+            with self._cond:
+                if cost == HEAVY:
+                    depth = self._heavy.get(instance_id, 1) - 1
+                    if depth:
+                        self._heavy[instance_id] = depth
+                    else:
+                        self._heavy.pop(instance_id, None)
+                        self._cond.notify_all()
+                if previous is not None:
+                    self._current[instance_id] = previous
+                else:
+                    self._current.pop(instance_id, None)
+
+def get_phase_gate(settings=None):
+    """Retorna o controle de fases do processo (criado na primeira chamada)."""
+    global _phase_gate
+    with _phase_gate_lock:
+        if _phase_gate is None:
+            settings = settings if settings is not None else ConfigManager().settings
+            _phase_gate = PhaseGate(settings.get('scheduler', {}).get('max_heavy_phases', 2))
+        return _phase_gate
@@ -0,0 +1,177 @@
+import threading
+import time
+from actions.frame_analysis import perceptual_hash, hamming_distance
+from core.instance_context import InstanceContext
+
+# ==============================================================================
+# MONITOR DE CONGELAMENTO (WATCHDOG)
+# ==============================================================================
+class FreezeWatchdog:
+    """
+    Monitora se a tela da instância está estática por muito tempo comparando
+    hashes perceptuais. Reaproveita os frames que a visão já capturou e
+    tolera pequenas animações (poucos bits diferentes).
+    """
+    def __init__(self, emu_manager, timeout_minutes=5, tolerance_bits=8, max_frame_age=10):
+        self.emu = emu_manager
+        self.timeout_seconds = timeout_minutes * 60
+        self.tolerance_bits = tolerance_bits
+        self.max_frame_age = max_frame_age
+        self.last_hash = None
+        self.last_change_time = time.time()
+        self.restarts = 0
+        self.package_name = "com.playshoo.texaspoker.romania" 
+
+    def check_and_recover(self):
+        """Verifica se a tela mudou ou se o app travou/congelou."""
+        current_hash = self._get_screen_hash()
+        if current_hash is None:
+            return True # Sem frame não dá para afirmar que travou
+
+        if self.last_hash is None or hamming_distance(current_hash, self.last_hash) > self.tolerance_bits:
+            self.last_hash = current_hash
+            self.last_change_time = time.time()
+            return True 
+
+        elapsed = time.time() - self.last_change_time
+        if elapsed > self.timeout_seconds:
+            print(f"\n[🚨] INSTÂNCIA {self.emu.instance_id} CONGELADA! Reiniciando...")
+            self._force_restart_app()
+            self.restarts += 1
+            self.last_change_time = time.time()
+            return False
+        return True
+
+    def static_seconds(self):
+        """Há quantos segundos a tela não muda."""
+        return time.time() - self.last_change_time
+
+    def _get_screen_hash(self):
+        """
+        Gera o hash perceptual do frame mais recente da instância.
+        Só captura uma tela nova se a visão não capturou nada recentemente.
+        """
+        try:
+            vision = InstanceContext.of(self.emu).vision
+            frame, frame_time = vision.latest_frame()
+            if frame is None or time.time() - frame_time > self.max_frame_age:
+                frame = vision.capture_frame()
+            if frame is not None:
+                return perceptual_hash(frame)
+        except Exception as e:
+            self.emu.log.warning(f"Watchdog: falha ao obter frame da instância {self.emu.instance_id}: {e}")
+        return None
+
+    def _force_restart_app(self):
+        """Força o fechamento e reabertura do app via comandos ADB protegidos."""
+        # Usa o executor do emu para garantir compatibilidade com caminhos de espaços
+        self.emu._execute_memuc(['adb', '-i', str(self.emu.instance_id), 'shell', 'am', 'force-stop', self.package_name])
+        time.sleep(2)
+        self.emu._execute_memuc(['adb', '-i', str(self.emu.instance_id), 'shell', 'monkey', '-p', self.package_name, '1'])
+
+
+# ==============================================================================
+# SUPERVISOR DA FROTA
+# ==============================================================================
+class FleetWatchdog(threading.Thread):
+    """
+    Thread única que amostra todas as instâncias registradas em intervalos fixos.
+    Mantém um FreezeWatchdog por instância (que reinicia o app congelado) e
+    expõe o estado de vida de cada uma para os outros componentes.
+    Status: ATIVA, ESTATICA (parada há mais da metade do limite) e
+    REINICIADA (congelou e o app foi reiniciado na última amostra).
+    """
+    def __init__(self, sample_interval=30, timeout_minutes=5, tolerance_bits=8):
+        super().__init__(name="FleetWatchdog", daemon=True)
+        self.sample_interval = sample_interval
+        self.timeout_minutes = timeout_minutes
+        self.tolerance_bits = tolerance_bits
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watchdogs = {}   # instance_id -> FreezeWatchdog
+        self._states = {}      # instance_id -> dict de estado
+
+    def register(self, emu_or_context):
+        """Passa a monitorar a instância (EmulatorManager ou InstanceContext)."""
+        ctx = InstanceContext.of(emu_or_context)
+        watchdog = FreezeWatchdog(ctx.emu, timeout_minutes=self.timeout_minutes, tolerance_bits=self.tolerance_bits)
+        with self._lock:
+            self._watchdogs[ctx.instance_id] = watchdog
+            self._states[ctx.instance_id] = {
+                "status": "ATIVA",
+                "static_seconds": 0.0,
+                "last_sample": None,
+                "restarts": 0,
+            }
+        ctx.log.info(f"[👁] Instância {ctx.instance_id} registrada no watchdog da frota.")
+
+    def unregister(self, instance_id):
+        with self._lock:
+            self._watchdogs.pop(instance_id, None)
+            self._states.pop(instance_id, None)
+
+    def get_state(self, instance_id):
+        """Cópia do estado da instância ou None se ela não é monitorada."""
+        with self._lock:
+            state = self._states.get(instance_id)
+            return dict(state) if state else None
+
+    def get_all_states(self):
+        with self._lock:
+            return {i: dict(s) for i, s in self._states.items()}
+
+    def is_alive_instance(self, instance_id):
+        """True se a instância é monitorada e a tela está mudando normalmente."""
+        state = self.get_state(instance_id)
+        return bool(state) and state["status"] == "ATIVA"
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.wait(self.sample_interval):
+            with self._lock:
+                watchdogs = list(self._watchdogs.items())
+
+            for instance_id, watchdog in watchdogs:
+                try:
+                    recovered = not watchdog.check_and_recover()
+                except Exception as e:
+                    watchdog.emu.log.error(f"Watchdog da frota: erro ao amostrar instância {instance_id}: {e}")
+                    continue
+
+                static = watchdog.static_seconds()
+                if recovered:
+                    status = "REINICIADA"
+                elif static > watchdog.timeout_seconds / 2:
+                    status = "ESTATICA"
+                else:
+                    status = "ATIVA"
+
+                with self._lock:
+                    if instance_id in self._states:
+                        self._states[instance_id].update({
+                            "status": status,
+                            "static_seconds": static,
+                            "last_sample": time.time(),
+                            "restarts": watchdog.restarts,
+                        })
+
+
+_FLEET_WATCHDOG = None
+_FLEET_WATCHDOG_LOCK = threading.Lock()
+
+def get_fleet_watchdog(settings=None):
+    """Retorna (e inicia na primeira chamada) o supervisor único da frota."""
+    global _FLEET_WATCHDOG
+    with _FLEET_WATCHDOG_LOCK:
+        if _FLEET_WATCHDOG is None:
+            cfg = (settings or {}).get('watchdog', {}) or {}
+            _FLEET_WATCHDOG = FleetWatchdog(
+                sample_interval=cfg.get('sample_interval_seconds', 30),
+                timeout_minutes=cfg.get('freeze_timeout_minutes', 5),
+                tolerance_bits=cfg.get('tolerance_bits', 8),
+            )
+            _FLEET_WATCHDOG.start()
+        return _FLEET_WATCHDOG
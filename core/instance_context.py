@@ -0,0 +1,85 @@
+import threading
+from core.emulator_manager import EmulatorManager
+
+class InstanceContext:
+    """
+    Contexto de serviços de uma instância do MEmu.
+    Dono de um único EmulatorManager, ImageRecognition, ClickActions,
+    OCRManager e AccountRegistry, compartilhados por todos os módulos de ação
+    da instância (em vez de cada módulo construir os seus).
+    """
+
+    def __init__(self, instance_id, emulator_manager=None):
+        self.emu = emulator_manager or EmulatorManager(instance_id=instance_id)
+        self.instance_id = self.emu.instance_id
+        self.log = self.emu.log
+
+        self._lock = threading.RLock()
+        self._vision = None
+        self._click = None
+        self._ocr = None
+        self._registry = None
+
+        # Permite que módulos que só recebem o EmulatorManager achem o contexto
+        self.emu.context = self
+
+    @classmethod
+    def of(cls, source, instance_id=None):
+        """
+        Resolve o contexto a partir de um InstanceContext ou de um EmulatorManager.
+        Módulos construídos com o mesmo EmulatorManager recebem o mesmo contexto.
+        """
+        if isinstance(source, cls):
+            return source
+        context = getattr(source, 'context', None)
+        if context is None:
+            context = cls(instance_id if instance_id is not None else source.instance_id, emulator_manager=source)
+        return context
+
+    def phase(self, name, cost="LIGHT"):
+        """
+        Marca uma etapa do fluxo com sua classe de custo (HEAVY/LIGHT).
+        Etapas HEAVY esperam vaga no controle de fases da frota.
+        Uso: with ctx.phase("boot", HEAVY): ...
+        """
+        from core.fleet_scheduler import get_phase_gate
+        return get_phase_gate(self.emu.config.settings).phase(self.instance_id, name, cost, log=self.log)
+
+    # --- SERVIÇOS (criados sob demanda, uma vez por instância) ---
+
+    @property
+    def vision(self):
+        with self._lock:
+            if self._vision is None:
+                from actions.image_recognition import ImageRecognition
+                self._vision = ImageRecognition(self.emu, self.instance_id)
+            return self._vision
+
+    @property
+    def click(self):
+        with self._lock:
+            if self._click is None:
+                from actions.click_actions import ClickActions
+                self._click = ClickActions(self.emu, self.instance_id)
+            return self._click
+
+    @property
+    def ocr(self):
+        with self._lock:
+            if self._ocr is None:
+                from actions.ocr_manager import OCRManager
+                self._ocr = OCRManager(self)
+            return self._ocr
+
+    @property
+    def registry(self):
+        with self._lock:
+            if self._registry is None:
+                from core.account_registry import AccountRegistry
+                cfg = self.emu.config.settings.get('registry', {})
+                self._registry = AccountRegistry(
+                    write_behind=cfg.get('write_behind', True),
+                    batch_size=cfg.get('batch_size', 100),
+                    flush_interval=cfg.get('flush_interval_seconds', 0.5)
+                )
+            return self._registry
@@ -61,10 +61,22 @@ class InstanceManager:
         self.delete_instance(instance_id)
         time.sleep(2) # Pequena pausa para o sistema de arquivos liberar o vmdk
         
-        # 2. Cria uma nova a partir da base
-        new_id = self.create_new_account_instance(base_id)
+        # 2. Pega uma nova a partir da base (pronta no pool, se habilitado)
+        new_id = self.take_instance(base_id)
         return new_id
 
+    def take_instance(self, base_id=0):
+        """
+        Retorna uma instância nova da base. Com 'clone_pool.enabled' no settings.yaml,
+        entrega um clone já preparado em segundo plano; senão, clona na hora.
+        """
+        settings = self.emu.config.settings
+        if settings.get('clone_pool', {}).get('enabled', False):
+            from core.clone_pool import get_clone_pool
+            pool = get_clone_pool(base_id, settings)
+            return pool.acquire(timeout=settings['clone_pool'].get('acquire_timeout_seconds', 0))
+        return self.create_new_account_instance(base_id)
+
     def list_all_instances(self):
         """
         [NOVO] Consulta o MEmu e retorna uma lista formatada de todas as instâncias.
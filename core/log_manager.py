@@ -1,37 +1,119 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 
+# Pipeline único do processo: os loggers só enfileiram; uma thread (QueueListener)
+# formata e escreve no console e nos arquivos de todas as instâncias.
+_log_queue = queue.Queue(-1)
+_listener = None
+_listener_lock = threading.Lock()
+_log_files = {} # nome do logger -> caminho do arquivo
+
+class _InstanceFileRouter(logging.Handler):
+    """Encaminha cada registro para o arquivo rotativo do seu logger (bot_N.log)."""
+
+    def __init__(self, max_bytes, backup_count):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._handlers = {}
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        for handler in self._handlers.values():
+            handler.setFormatter(fmt)
+
+    def emit(self, record):
+        handler = self._handlers.get(record.name)
+        if handler is None:
+            path = _log_files.get(record.name)
+            if path is None:
+                return
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8'
+            )
+            handler.setFormatter(self.formatter)
+            self._handlers[record.name] = handler
+        handler.handle(record)
+
+    def close(self):
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
+
+def _start_listener(config):
+    """Cria a thread de escrita na primeira chamada (configuração da seção 'logging')."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        # Formato do log: Data - Nome - Nível - Mensagem
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = []
+
+        if config.get('save_to_file', True):
+            # Handler para arquivo individual (com rotação por tamanho)
+            router = _InstanceFileRouter(
+                max_bytes=config.get('max_bytes', 5 * 1024 * 1024),
+                backup_count=config.get('backup_count', 3)
+            )
+            router.setFormatter(formatter)
+            handlers.append(router)
+
+        # Handler para o console (opcional, para visualização em tempo real)
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(str(config.get('console_level', 'INFO')).upper())
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+        _listener = logging.handlers.QueueListener(_log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+def stop_logging():
+    """Esvazia a fila de logs e encerra a thread de escrita (chamado na saída do processo)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+atexit.register(stop_logging)
+
 class LogManager:
-    def __init__(self, instance_id=None):
+    def __init__(self, instance_id=None, config=None):
+        """
+        :param config: Seção 'logging' do settings.yaml (level, console_level,
+                       save_to_file, max_bytes, backup_count).
+        """
         self.log_dir = "logs"
         if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
-        
+            os.makedirs(self.log_dir, exist_ok=True)
+
         self.instance_id = instance_id
+        self.config = config or {}
         self.logger = self._setup_logger()
 
     def _setup_logger(self):
         # Define o nome do logger baseado no ID da instância ou 'main'
         logger_name = f"Instance_{self.instance_id}" if self.instance_id is not None else "Main_System"
         logger = logging.getLogger(logger_name)
-        logger.setLevel(logging.INFO)
+        logger.setLevel(str(self.config.get('level', 'INFO')).upper())
+
+        _start_listener(self.config)
 
         # Evita duplicar handlers se o logger já existir
         if not logger.handlers:
-            # Formato do log: Data - Nome - Nível - Mensagem
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-            # Handler para arquivo individual
             file_name = f"bot_{self.instance_id if self.instance_id is not None else 'system'}.log"
-            file_handler = logging.FileHandler(os.path.join(self.log_dir, file_name), encoding='utf-8')
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            _log_files[logger_name] = os.path.join(self.log_dir, file_name)
 
-            # Handler para o console (opcional, para visualização em tempo real)
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+            # A thread do bot só paga o enfileiramento
+            logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 
         return logger
 
@@ -43,6 +125,6 @@ class LogManager:
 
     def warning(self, message):
         self.logger.warning(message)
-        
+
     def critical(self, message):
-        self.logger.critical(message)
\ No newline at end of file
+        self.logger.critical(message)
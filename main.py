@@ -1,61 +1,13 @@
 import sys
 import os
-import time
-import hashlib
-import threading
 from bots.bot_conta_nova import NewAccountOrchestrator
 from core.instance_manager import InstanceManager
 from core.emulator_manager import EmulatorManager
-
-# ==============================================================================
-# MONITOR DE CONGELAMENTO (WATCHDOG)
-# ==============================================================================
-class FreezeWatchdog:
-    """
-    Monitora se a tela da instância está estática por muito tempo comparando hashes.
-    """
-    def __init__(self, emu_manager, timeout_minutes=5):
-        self.emu = emu_manager
-        self.timeout_seconds = timeout_minutes * 60
-        self.last_hash = None
-        self.last_change_time = time.time()
-        self.package_name = "com.playshoo.texaspoker.romania" 
-
-    def check_and_recover(self):
-        """Verifica se a tela mudou ou se o app travou/congelou."""
-        current_hash = self._get_screen_hash()
-        
-        if current_hash != self.last_hash:
-            self.last_hash = current_hash
-            self.last_change_time = time.time()
-            return True 
-
-        elapsed = time.time() - self.last_change_time
-        if elapsed > self.timeout_seconds:
-            print(f"\n[🚨] INSTÂNCIA {self.emu.instance_id} CONGELADA! Reiniciando...")
-            self._force_restart_app()
-            self.last_change_time = time.time()
-            return False
-        return True
-
-    def _get_screen_hash(self):
-        """Gera hash MD5 utilizando o método take_screenshot do EmulatorManager."""
-        temp_path = f"logs/freeze_check_{self.emu.instance_id}.png"
-        try:
-            # Chama a função corrigida no emulator_manager.py
-            self.emu.take_screenshot(temp_path)
-            if os.path.exists(temp_path):
-                with open(temp_path, "rb") as f:
-                    return hashlib.md5(f.read()).hexdigest()
-        except: return None
-        return None
-
-    def _force_restart_app(self):
-        """Força o fechamento e reabertura do app via comandos ADB protegidos."""
-        # Usa o executor do emu para garantir compatibilidade com caminhos de espaços
-        self.emu._execute_memuc(['adb', '-i', str(self.emu.instance_id), 'shell', 'am', 'force-stop', self.package_name])
-        time.sleep(2)
-        self.emu._execute_memuc(['adb', '-i', str(self.emu.instance_id), 'shell', 'monkey', '-p', self.package_name, '1'])
+from core.config_manager import ConfigManager
+from actions.template_library import TemplateLibrary
+from core.fleet_watchdog import get_fleet_watchdog
+from core.fleet_scheduler import FleetScheduler
+from core.clone_pool import ClonePool, get_clone_pool
 
 # ==============================================================================
 # FUNÇÕES DE GESTÃO E DIAGNÓSTICO
@@ -105,25 +57,49 @@ def check_instance_network(instance_id):
 # ==============================================================================
 
 def run_single_instance(instance_id):
-    """Lança o bot completo. O orquestrador chamará get_screen_resolution."""
+    """
+    Lança o bot completo. O orquestrador chamará get_screen_resolution.
+    A instância fica registrada no watchdog da frota enquanto o fluxo roda.
+    """
+    watchdog = None
+    resultado = "ERROR"
     try:
         orchestrator = NewAccountOrchestrator(instance_id=instance_id)
+        watchdog = get_fleet_watchdog(orchestrator.emu.config.settings)
+        watchdog.register(orchestrator.ctx)
         resultado = orchestrator.run()
         print(f"\n[🏁] FINALIZADO: Instância {instance_id} retornou: {resultado}")
     except Exception as e:
         print(f"❌ Erro crítico na execução da instância {instance_id}: {e}")
+    finally:
+        if watchdog:
+            watchdog.unregister(instance_id)
+    return resultado
 
 def run_stress_test(instance_ids):
-    """Dispara múltiplas instâncias em paralelo."""
-    threads = []
+    """
+    Executa várias instâncias pelo escalonador da frota: o próximo boot só é
+    admitido com worker livre, poucas instâncias em boot e CPU/RAM disponíveis.
+    """
     print(f"\n[🔥] INICIANDO ESTRESSE EM {len(instance_ids)} INSTÂNCIAS...")
-    for idx in instance_ids:
-        t = threading.Thread(target=run_single_instance, args=(idx,))
-        threads.append(t)
-        t.start()
-        time.sleep(8) # Aumentado para dar tempo ao MEmu processar os logs iniciais
-    for t in threads:
-        t.join()
+    resultados = FleetScheduler(run_single_instance).run(instance_ids)
+    for idx, resultado in sorted(resultados.items()):
+        print(f"  - Instância {idx}: {resultado}")
+    return resultados
+
+def ask_instance_ids():
+    """
+    Lê a lista de IDs do console; vazio = todas as instâncias exceto a base (ID 0)
+    e os clones reservados no pool.
+    """
+    texto = input("IDs das instâncias (ex: 1,2,3) ou Enter para todas: ").strip()
+    if texto:
+        return [int(i) for i in texto.replace(' ', '').split(',') if i]
+    im = InstanceManager(EmulatorManager(instance_id=0))
+    return [
+        int(inst['id']) for inst in im.list_all_instances()
+        if str(inst['id']) != "0" and not inst['name'].startswith(ClonePool.POOL_PREFIX)
+    ]
 
 def setup_environment():
     """Garante que todas as pastas de suporte existam."""
@@ -131,6 +107,16 @@ def setup_environment():
     for folder in folders:
         os.makedirs(folder, exist_ok=True)
 
+    # Carrega os templates uma única vez, antes das threads das instâncias
+    total = TemplateLibrary.shared().preload()
+    print(f"[*] {total} templates carregados de assets/buttons/.")
+
+    # Pool de clones começa a encher já na inicialização
+    settings = ConfigManager().settings
+    if settings.get('clone_pool', {}).get('enabled', False):
+        pool = get_clone_pool(0, settings)
+        print(f"[*] Pool de clones ativo ({pool.ready_count()}/{pool.size} prontos).")
+
 def main():
     setup_environment()
     while True:
@@ -153,12 +139,14 @@ def main():
             except ValueError: print("❌ Erro: O ID deve ser um número.")
         
         elif opcao == "2":
-            run_stress_test([1, 2, 3, 4])
+            try:
+                run_stress_test(ask_instance_ids())
+            except ValueError: print("❌ Erro: Os IDs devem ser números.")
         
         elif opcao == "3":
             emu_base = EmulatorManager(instance_id=0)
             im = InstanceManager(emu_base)
-            im.create_new_account_instance(base_id=0)
+            im.take_instance(base_id=0)
 
         elif opcao == "4":
             try:
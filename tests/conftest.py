@@ -0,0 +1,50 @@
+import logging
+from types import SimpleNamespace
+
+import cv2
+import pytest
+
+# Print da tela inicial do jogo e um botão pequeno, ambos incluídos nos assets
+TELA_INICIAL = "assets/buttons/bot_recolher_amigos/05_tela_inicial.PNG"
+BOTAO = "bot_recolher_amigos/botao_enviar_presente_2.png" # Nome relativo a assets/buttons/
+
+class EmuFalso:
+    """EmulatorManager mínimo: só o que os módulos de ação leem na construção."""
+
+    def __init__(self, instance_id=900, settings=None, timings=None):
+        self.instance_id = instance_id
+        self.log = logging.getLogger(f"teste_{instance_id}")
+        self.config = SimpleNamespace(settings=settings or {}, timings=timings or {})
+        self.context = None
+
+@pytest.fixture
+def carrega_tela():
+    """Lê um print dos assets no tamanho padrão das instâncias (1280x720, BGR)."""
+    def carrega(path=TELA_INICIAL):
+        return cv2.resize(cv2.imread(path), (1280, 720), interpolation=cv2.INTER_AREA)
+    return carrega
+
+@pytest.fixture
+def tela_base(carrega_tela):
+    return carrega_tela()
+
+@pytest.fixture
+def botao():
+    """Nome (em assets/buttons/) do template colado pelo com_botao."""
+    return BOTAO
+
+@pytest.fixture
+def com_botao():
+    """Cola um template dos assets numa cópia da tela, como aconteceria no jogo."""
+    def cola(tela, template=BOTAO, x=900, y=500):
+        botao = cv2.imread(f"assets/buttons/{template}")
+        h, w = botao.shape[:2]
+        tela = tela.copy()
+        tela[y:y + h, x:x + w] = botao
+        return tela
+    return cola
+
+@pytest.fixture
+def emu_falso():
+    """Fábrica de EmulatorManager falso: emu_falso(instance_id, settings=..., timings=...)."""
+    return EmuFalso
@@ -0,0 +1,67 @@
+import json
+import threading
+
+from core.account_registry import AccountRegistry
+
+def test_importa_json_uma_unica_vez(tmp_path):
+    print("\n=== TESTE DE IMPORTAÇÃO DO REGISTRO JSON ===")
+    json_path = tmp_path / "accounts.json"
+    json_path.write_text(json.dumps([
+        {"nickname": "conta_a", "instance_origin": 1, "status": "Pronta", "data_criacao": "2024-01-01 10:00:00", "maturada": False},
+        {"nickname": "conta_b", "instance_origin": 2, "status": "MATURADA_COMPLETA", "data_criacao": "2024-01-01 11:00:00", "maturada": True}
+    ]))
+    db_path = str(tmp_path / "accounts.db")
+
+    registry = AccountRegistry(db_path=db_path, json_path=str(json_path))
+    assert registry.get_account_status(1) == "Pronta"
+    assert registry.get_account_status(2) == "MATURADA_COMPLETA"
+    registry.close()
+
+    # Reabrir o banco não duplica as contas
+    registry = AccountRegistry(db_path=db_path, json_path=str(json_path))
+    assert registry.import_json(str(json_path)) == 0
+    assert registry._conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0] == 2
+    registry.close()
+
+def test_registro_concorrente_e_status(tmp_path):
+    print("\n=== TESTE DE ESCRITA CONCORRENTE NO REGISTRO ===")
+    db_path = str(tmp_path / "accounts.db")
+    registries = [AccountRegistry(db_path=db_path, json_path=None) for _ in range(4)]
+    assert all(r.writer is registries[0].writer for r in registries) # Um único gravador por banco
+
+    def worker(instance_id):
+        registry = registries[instance_id]
+        for i in range(25):
+            assert registry.register_account(f"nick_{instance_id}_{i}", instance_id)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    registry = registries[0]
+    assert registry.flush(timeout=10)
+    assert registry._conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0] == 100
+
+    assert registry.update_status(3, "MATURADA_COMPLETA")
+    assert not registry.update_status(99, "MATURADA_COMPLETA")
+    assert registry.get_account_status(3) == "MATURADA_COMPLETA"
+
+    # Conta ainda na fila do gravador também é encontrada
+    assert registry.register_account("conta_nova", 7)
+    assert registry.update_status(7, "Em Maturação")
+    assert registry.get_account_status(7) == "Em Maturação"
+    assert registry.get_account_status(2) == "Pronta"
+    for r in registries:
+        r.close()
+
+def test_registro_sincrono(tmp_path):
+    print("\n=== TESTE DO REGISTRO SEM WRITE-BEHIND ===")
+    registry = AccountRegistry(db_path=str(tmp_path / "accounts.db"), json_path=None, write_behind=False)
+    assert registry.register_account("conta_sync", 5)
+    assert registry.update_status(5, "MATURADA_COMPLETA")
+    assert not registry.update_status(99, "MATURADA_COMPLETA")
+    row = registry._conn.execute("SELECT maturada, data_maturacao FROM accounts WHERE instance_origin = 5").fetchone()
+    assert row["maturada"] == 1 and row["data_maturacao"]
+    registry.close()
@@ -0,0 +1,38 @@
+import stat
+import sys
+
+import pytest
+
+from core.adb_shell import AdbShellSession
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="memuc falso usa /bin/sh")
+
+def _fake_memuc(tmp_path):
+    """memuc falso: 'adb -i N shell' vira um /bin/sh local."""
+    path = tmp_path / "memuc"
+    path.write_text('#!/bin/sh\nshift 4\nexec /bin/sh\n')
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+def test_comando_e_codigo_de_retorno(tmp_path):
+    print("\n=== TESTE DO CANAL ADB PERSISTENTE ===")
+    session = AdbShellSession(_fake_memuc(tmp_path), 0)
+    try:
+        assert session.execute("echo ola") == ("ola\n", 0)
+        assert session.execute("exit_code() { return 3; }; exit_code")[1] == 3
+    finally:
+        session.close()
+
+def test_timeout_nao_reenvia_comando(tmp_path):
+    print("\n=== TESTE DE TIMEOUT SEM REENVIO ===")
+    marker = tmp_path / "execucoes"
+    session = AdbShellSession(_fake_memuc(tmp_path), 0)
+    try:
+        result = session.execute(f"echo run >> {marker}; sleep 5", timeout=1)
+        assert result == ("", AdbShellSession.TIMEOUT_RETURNCODE)
+        assert marker.read_text().count("run") == 1
+
+        # O canal reconecta normalmente no comando seguinte
+        assert session.execute("echo ok") == ("ok\n", 0)
+    finally:
+        session.close()
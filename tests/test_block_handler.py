@@ -0,0 +1,95 @@
+import cv2
+import numpy as np
+import pytest
+
+from core.block_handler import BlockHandler
+
+REGIAO = {"x": 340, "y": 200, "w": 600, "h": 300}
+
+# Prints do jogo incluídos nos assets (os menores são recortes esticados para 1280x720)
+TELAS_DO_JOGO = [
+    "assets/buttons/bot_recolher_amigos/05_tela_inicial.PNG",
+    "assets/buttons/bot_recolher_amigos/desafio.PNG",
+    "assets/buttons/bot_recolher_amigos/02_roda_fortuna.PNG",
+    "assets/buttons/bot_novas_contas/lobby.PNG",
+    "assets/buttons/bot_novas_contas/slot_9_linhas.PNG",
+]
+
+class _VisaoFalsa:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def capture_frame(self, use_cache=True):
+        return self.frame
+
+    def find_element(self, template_name, threshold=0.8, click=False, region=None):
+        return None # Template não bate (ex: outra resolução/idioma do aviso)
+
+class _OcrFalso:
+    def __init__(self, texto):
+        self.texto = texto
+        self.chamadas = 0
+
+    def get_text_from_region(self, region_name, frame=None, psm=7):
+        self.chamadas += 1
+        return self.texto
+
+def _handler(emu, frame, texto=""):
+    handler = object.__new__(BlockHandler)
+    handler.emu = emu
+    handler.instance_id = emu.instance_id
+    handler.log = emu.log
+    handler.img_rec = _VisaoFalsa(frame)
+    handler.ocr = _OcrFalso(texto)
+    handler.min_edge_ratio = 0.005
+    handler.dim_level = 100
+    return handler
+
+@pytest.fixture
+def emu(emu_falso):
+    return emu_falso(903, timings={"ui_regions": {"aviso_bloqueio": REGIAO}})
+
+def _tela_bloqueio():
+    """Página de banimento capturada, em tela cheia escura (sem modal sobre o jogo)."""
+    aviso = cv2.imread("assets/buttons/bot_novas_contas/popup_bloqueio.png")
+    tela = np.full((720, 1280, 3), (40, 10, 25), dtype=np.uint8)
+    tela[18:702, 135:1145] = cv2.resize(aviso, (1010, 684))
+    return tela
+
+def test_pagina_de_bloqueio_vai_para_o_ocr(emu):
+    print("\n=== TESTE DA PÁGINA DE BLOQUEIO ESCURA ===")
+    handler = _handler(emu, _tela_bloqueio(), texto="Conta encerrada... não será desbloqueada. Conta bloqueada")
+    assert handler._has_dialog_cue(handler.img_rec.frame)
+    assert handler.is_account_blocked()
+    assert handler.ocr.chamadas == 1
+
+def test_tela_lisa_pula_o_ocr(emu):
+    print("\n=== TESTE DA TELA SEM TEXTO ===")
+    handler = _handler(emu, np.full((720, 1280, 3), 20, dtype=np.uint8))
+    assert not handler.is_account_blocked()
+    assert handler.ocr.chamadas == 0
+
+def test_modal_sobre_tela_escurecida_vai_para_o_ocr(emu, carrega_tela):
+    print("\n=== TESTE DO MODAL SOBRE O JOGO ESCURECIDO ===")
+    tela = (carrega_tela() * 0.45).astype(np.uint8) # Fundo escurecido pelo modal
+    x, y, w, h = REGIAO["x"], REGIAO["y"], REGIAO["w"], REGIAO["h"]
+    tela[y:y + h, x:x + w] = (235, 235, 235)
+    cv2.putText(tela, "Sua conta foi bloqueada", (x + 40, y + 150), cv2.FONT_HERSHEY_SIMPLEX, 1.1, (30, 30, 30), 2)
+
+    handler = _handler(emu, tela, texto="sua conta foi bloqueada")
+    assert handler.is_account_blocked()
+    assert handler.ocr.chamadas == 1
+
+def test_pagina_de_bloqueio_em_tela_cheia(emu):
+    print("\n=== TESTE DA PÁGINA DE BLOQUEIO ESTICADA NA TELA ===")
+    aviso = cv2.imread("assets/buttons/bot_novas_contas/popup_bloqueio.png")
+    handler = _handler(emu, cv2.resize(aviso, (1280, 720)))
+    assert handler._has_dialog_cue(handler.img_rec.frame)
+
+def test_telas_do_jogo_nao_rodam_ocr(emu, carrega_tela):
+    print("\n=== TESTE DAS TELAS NORMAIS DO JOGO ===")
+    for path in TELAS_DO_JOGO:
+        tela = carrega_tela(path)
+        handler = _handler(emu, tela, texto="jogar agora")
+        assert not handler.is_account_blocked(), path
+        assert handler.ocr.chamadas == 0, path
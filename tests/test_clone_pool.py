@@ -0,0 +1,46 @@
+import logging
+
+from core import clone_pool
+from core.clone_pool import ClonePool
+
+class _EmuFalso:
+    def __init__(self, instance_id=0):
+        self.instance_id = instance_id
+        self.log = logging.getLogger("teste_pool")
+        self.comandos = []
+
+    def _execute_memuc(self, args):
+        self.comandos.append(args)
+        return "SUCCESS"
+
+class _InstanceManagerFalso:
+    clones = 0
+
+    def __init__(self, emu):
+        self.emu = emu
+
+    def list_all_instances(self):
+        return [
+            {"id": "0", "name": "Base", "status": "Desligada"},
+            {"id": "4", "name": f"{ClonePool.POOL_PREFIX}0101_000000", "status": "Desligada"},
+            {"id": "5", "name": "Bot_Conta_0101_0000", "status": "Rodando"},
+        ]
+
+    def create_new_account_instance(self, base_id=0):
+        _InstanceManagerFalso.clones += 1
+        return 9
+
+def test_primeiro_acquire_usa_clone_que_sobrou(monkeypatch):
+    print("\n=== TESTE DO POOL DE CLONES: SOBRAS DA EXECUÇÃO ANTERIOR ===")
+    monkeypatch.setattr(clone_pool, "EmulatorManager", _EmuFalso)
+    monkeypatch.setattr(clone_pool, "InstanceManager", _InstanceManagerFalso)
+
+    pool = ClonePool(base_id=0, size=2) # Thread não iniciada: só a adoção síncrona
+    assert pool.ready_count() == 1
+    assert pool.acquire() == 4
+    assert _InstanceManagerFalso.clones == 0
+    assert pool.emu.comandos[-1][:3] == ['rename', '-i', '4']
+
+    # Estoque vazio: clona no caminho crítico
+    assert pool.acquire() == 9
+    assert _InstanceManagerFalso.clones == 1
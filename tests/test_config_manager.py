@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from core.config_manager import _ConfigStore
+
+def _grava(path, conteudo, passo):
+    """Reescreve o arquivo e avança o mtime (o sistema de arquivos pode ter resolução grossa)."""
+    path.write_text(conteudo, encoding="utf-8")
+    mtime = os.stat(path).st_mtime_ns + passo * 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+def test_recarrega_quando_mtime_muda(tmp_path):
+    print("\n=== TESTE DE RECARGA DA CONFIGURAÇÃO POR MTIME ===")
+    settings = tmp_path / "settings.yaml"
+    _grava(settings, "emulator:\n  instances_limit: 4\n", 0)
+
+    store = _ConfigStore(str(tmp_path), check_interval=60)
+    assert store.get("settings")["emulator"]["instances_limit"] == 4
+    assert store.get("timings") == {} # Arquivo inexistente vira {}
+
+    # Dentro do check_interval não há stat nem releitura
+    _grava(settings, "emulator:\n  instances_limit: 8\n", 1)
+    assert store.get("settings")["emulator"]["instances_limit"] == 4
+
+    store._next_check = 0
+    assert store.get("settings")["emulator"]["instances_limit"] == 8
+
+def test_erro_de_sintaxe_mantem_snapshot(tmp_path):
+    print("\n=== TESTE DE ARQUIVO INVÁLIDO ===")
+    settings = tmp_path / "settings.yaml"
+    _grava(settings, "vision:\n  match_mode: pyramid\n", 0)
+    store = _ConfigStore(str(tmp_path), check_interval=0)
+
+    _grava(settings, "vision: [sem fechar\n", 1)
+    assert store.get("settings")["vision"]["match_mode"] == "pyramid"
+
+    # Corrigido o arquivo, a próxima verificação recarrega
+    _grava(settings, "vision:\n  match_mode: full\n", 2)
+    assert store.get("settings")["vision"]["match_mode"] == "full"
+
+def test_snapshot_somente_leitura(tmp_path):
+    print("\n=== TESTE DO SNAPSHOT IMUTÁVEL ===")
+    _grava(tmp_path / "settings.yaml", "emulator:\n  instances: [0, 1]\n", 0)
+    settings = _ConfigStore(str(tmp_path)).get("settings")
+    with pytest.raises(TypeError):
+        settings["emulator"]["instances_limit"] = 2
+    assert settings["emulator"]["instances"] == (0, 1)
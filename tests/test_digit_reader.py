@@ -0,0 +1,100 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from actions.digit_reader import DigitReader
+from core.config_manager import ConfigManager
+
+FONTE = cv2.FONT_HERSHEY_SIMPLEX
+REGIAO_SALDO = {"x": 100, "y": 50, "w": 200, "h": 40}
+
+class _MotorFalso:
+    def __init__(self, persistente):
+        self.persistente = persistente
+
+    def warm_up(self):
+        return self.persistente
+
+class _OcrFalso:
+    def __init__(self, persistente=False):
+        self.chamadas = 0
+        self.engine = _MotorFalso(persistente)
+
+    def read_text(self, crop, psm=7, whitelist=None):
+        self.chamadas += 1
+        return ""
+
+def _gera_glifos(pasta):
+    for digito in range(10):
+        img = np.zeros((40, 30, 3), dtype=np.uint8)
+        cv2.putText(img, str(digito), (3, 32), FONTE, 1.1, (255, 255, 255), 2)
+        cv2.imwrite(str(pasta / f"{digito}.png"), img)
+
+def _leitor(emu, tmp_path):
+    _gera_glifos(tmp_path)
+    leitor = DigitReader(emu, glyph_dir=str(tmp_path))
+    leitor.ctx._ocr = _OcrFalso()
+    return leitor
+
+@pytest.fixture
+def emu(emu_falso):
+    return emu_falso(904, timings={"ui_regions": {"chips_amount": REGIAO_SALDO}})
+
+def _tela_com_saldo(texto):
+    """Frame 1280x720 com o saldo escrito dentro de ui_regions.chips_amount."""
+    tela = np.full((720, 1280, 3), 30, dtype=np.uint8)
+    cv2.putText(tela, texto, (105, 82), FONTE, 1.1, (255, 255, 255), 2)
+    return tela
+
+def test_glifos_carregados(emu, tmp_path):
+    print("\n=== TESTE DE CARGA DOS GLIFOS ===")
+    assert len(_leitor(emu, tmp_path).glyphs) == 10
+
+    # Conjunto incompleto não é usado
+    (tmp_path / "7.png").unlink()
+    assert DigitReader(emu, glyph_dir=str(tmp_path)).glyphs == {}
+
+def test_read_glyphs_ignora_separador(emu, tmp_path):
+    print("\n=== TESTE DE LEITURA POR GLIFOS ===")
+    leitor = _leitor(emu, tmp_path)
+    crop = _tela_com_saldo("12.345")[50:90, 100:300]
+    assert leitor._read_glyphs(crop) == 12345
+
+def test_read_int_sem_ocr(emu, tmp_path):
+    print("\n=== TESTE DO READ_INT NO FRAME CAPTURADO ===")
+    leitor = _leitor(emu, tmp_path)
+    assert leitor.read_int("chips_amount", frame=_tela_com_saldo("2.048")) == 2048
+    assert leitor.read_int((100, 50, 200, 40), frame=_tela_com_saldo("907")) == 907
+    assert leitor.ctx.ocr.chamadas == 0
+
+def test_read_int_cai_no_ocr_sem_glifos(emu, tmp_path):
+    print("\n=== TESTE DO FALLBACK PARA OCR ===")
+    leitor = DigitReader(emu, glyph_dir=str(tmp_path))
+    leitor.ctx._ocr = _OcrFalso()
+    assert leitor.read_int("chips_amount", frame=_tela_com_saldo("2.048")) is None
+    assert leitor.ctx.ocr.chamadas == 1
+
+def test_leitura_rapida_para_cada_giro(emu, tmp_path):
+    print("\n=== TESTE DA LEITURA BARATA (GLIFOS OU TESSEROCR) ===")
+    assert _leitor(emu, tmp_path).is_fast()
+
+    sem_glifos = DigitReader(emu, glyph_dir=str(tmp_path / "vazio"))
+    sem_glifos.ctx._ocr = _OcrFalso(persistente=True)
+    assert sem_glifos.is_fast()
+    sem_glifos.ctx._ocr = _OcrFalso(persistente=False)
+    assert not sem_glifos.is_fast()
+
+def test_read_int_com_configuracao_real(emu, tmp_path):
+    print("\n=== TESTE DO READ_INT COM O SNAPSHOT DO CONFIGMANAGER ===")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "timings.json").write_text(json.dumps({"ui_regions": {"chips_amount": REGIAO_SALDO}}))
+
+    emu.config = ConfigManager(str(config_dir)) # Regiões chegam como mappingproxy (somente leitura)
+    glifos = tmp_path / "digits"
+    glifos.mkdir()
+    _gera_glifos(glifos)
+    leitor = DigitReader(emu, glyph_dir=str(glifos))
+    assert leitor.read_int("chips_amount", frame=_tela_com_saldo("1.999")) == 1999
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from core.fleet_scheduler import HEAVY, LIGHT, PhaseGate
+
+def test_phase_gate_limita_fases_pesadas():
+    print("\n=== TESTE DO LIMITE DE FASES PESADAS ===")
+    gate = PhaseGate(max_heavy=2)
+    lock = threading.Lock()
+    simultaneas, pico = 0, 0
+
+    def worker(instance_id):
+        nonlocal simultaneas, pico
+        with gate.phase(instance_id, "boot", HEAVY):
+            with lock:
+                simultaneas += 1
+                pico = max(pico, simultaneas)
+            time.sleep(0.05)
+            with lock:
+                simultaneas -= 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert pico == 2
+    assert gate.heavy_count() == 0
+
+def test_phase_gate_fase_leve_nao_espera():
+    print("\n=== TESTE DA FASE LEVE COM VAGAS OCUPADAS ===")
+    gate = PhaseGate(max_heavy=1)
+    liberar = threading.Event()
+
+    def ocupa():
+        with gate.phase(0, "boot", HEAVY):
+            liberar.wait(5)
+
+    t = threading.Thread(target=ocupa)
+    t.start()
+    while gate.heavy_count() == 0:
+        time.sleep(0.01)
+
+    inicio = time.time()
+    with gate.phase(1, "slot", LIGHT):
+        assert gate.get_phase(1)[:2] == ("slot", LIGHT)
+    assert time.time() - inicio < 0.5
+    assert gate.get_phase(1) is None
+
+    liberar.set()
+    t.join(timeout=5)
+
+def test_phase_gate_reentrante():
+    print("\n=== TESTE DE REENTRÂNCIA DA FASE PESADA ===")
+    gate = PhaseGate(max_heavy=1)
+    with gate.phase(0, "boot", HEAVY):
+        # Fase pesada dentro de outra da mesma instância não espera vaga
+        with gate.phase(0, "login", HEAVY):
+            assert gate.heavy_count() == 1
+            assert gate.get_phase(0)[0] == "login"
+        assert gate.heavy_count() == 1
+        assert gate.get_phase(0)[0] == "boot"
+    assert gate.heavy_count() == 0
+    assert gate.get_phase(0) is None
@@ -0,0 +1,50 @@
+import time
+from types import MappingProxyType
+
+from actions.image_recognition import ImageRecognition
+
+VISAO = {"vision": {"capture_mode": "stream", "adaptive_polling": True, "min_poll_interval": 0.02}}
+
+def _visao(emu_falso, instance_id):
+    emu = emu_falso(instance_id, settings=VISAO)
+    return ImageRecognition(emu, instance_id)
+
+def test_polling_adaptativo_encontra_botao_em_tela_parada(tela_base, com_botao, botao, emu_falso):
+    print("\n=== TESTE DO POLLING ADAPTATIVO COM BOTÃO PEQUENO ===")
+    base = tela_base
+    # A tela fica parada e depois só o botão aparece (a média do frame quase não muda)
+    frames = [base] * 4 + [com_botao(base)]
+
+    visao = _visao(emu_falso, 900)
+    visao._grab_frame = lambda: (frames.pop(0) if len(frames) > 1 else frames[0]).copy()
+    visao._save_error_snapshot = lambda element_name: None
+
+    inicio = time.time()
+    # Timeout menor que o interval: só acha se a mudança local for detectada
+    pos = visao.wait_for_element(botao, timeout=1.5, interval=2)
+    assert pos is not None
+    assert time.time() - inicio < 1.5
+    assert abs(pos[0] - 900) < 200 and abs(pos[1] - 500) < 100
+
+def test_regiao_do_snapshot_de_configuracao(tela_base, com_botao, botao, emu_falso):
+    print("\n=== TESTE DE REGIÃO VINDA DO TIMINGS (MAPPINGPROXY) ===")
+    tela = com_botao(tela_base)
+    visao = _visao(emu_falso, 901)
+    visao._grab_frame = lambda: tela.copy()
+
+    regiao = MappingProxyType({"x": 850, "y": 450, "w": 300, "h": 200})
+    assert visao.find_element(botao, region=regiao) is not None
+
+def test_polling_adaptativo_recua_em_tela_parada(tela_base, botao, emu_falso):
+    print("\n=== TESTE DO RECUO DO POLLING COM A TELA PARADA ===")
+    base = tela_base
+    capturas = []
+
+    visao = _visao(emu_falso, 902)
+    visao._grab_frame = lambda: capturas.append(1) or base.copy()
+    visao._save_error_snapshot = lambda element_name: None
+
+    assert visao.wait_for_element(botao, timeout=3, interval=1) is None
+    # Recuo 0.02 -> 1s: ~6 capturas até chegar ao interval e depois uma por segundo
+    print(f"{len(capturas)} capturas em 3s")
+    assert len(capturas) <= 10
@@ -0,0 +1,60 @@
+import numpy as np
+
+from actions import ocr_manager
+from actions.ocr_manager import TesseractEngine
+
+class _ApiFalsa:
+    def SetPageSegMode(self, psm): pass
+    def SetVariable(self, name, value): pass
+    def SetImageBytes(self, *args): pass
+    def GetUTF8Text(self): return "persistente\n"
+    def End(self): pass
+
+class _TesserocrFalho:
+    """tesserocr instalado, mas sem achar o tessdata (cenário comum no Windows)."""
+    chamadas = 0
+
+    @classmethod
+    def PyTessBaseAPI(cls, path=None):
+        cls.chamadas += 1
+        raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+
+class _TesserocrOk:
+    PyTessBaseAPI = _ApiFalsa
+
+def _imagem(valor):
+    return np.full((10, 20), valor, dtype=np.uint8)
+
+def test_falha_do_tesserocr_cai_no_pytesseract(monkeypatch):
+    print("\n=== TESTE DE FALHA AO CARREGAR O TESSEROCR ===")
+    monkeypatch.setattr(ocr_manager, "tesserocr", _TesserocrFalho)
+    monkeypatch.setattr(ocr_manager.pytesseract, "image_to_string", lambda image, config="": "fallback\n")
+
+    engine = TesseractEngine(pool_size=2, acquire_timeout=0.1)
+    assert not engine.warm_up() # Falha já na inicialização, antes da primeira leitura
+    # Mais leituras que o tamanho do pool: nenhuma pode travar
+    for i in range(5):
+        assert engine.recognize(_imagem(i)) == "fallback"
+    assert not engine.persistent
+    assert _TesserocrFalho.chamadas == 1
+
+def test_warm_up_com_tesserocr(monkeypatch):
+    print("\n=== TESTE DO WARM-UP DO MOTOR PERSISTENTE ===")
+    monkeypatch.setattr(ocr_manager, "tesserocr", _TesserocrOk)
+    engine = TesseractEngine(pool_size=1, acquire_timeout=0.05)
+    assert engine.warm_up()
+    assert engine._apis.qsize() == 1 # A API carregada volta para o pool
+
+def test_pool_ocupado_respeita_timeout(monkeypatch):
+    print("\n=== TESTE DO TIMEOUT DO POOL DE APIS ===")
+    monkeypatch.setattr(ocr_manager, "tesserocr", _TesserocrOk)
+    monkeypatch.setattr(ocr_manager.pytesseract, "image_to_string", lambda image, config="": "fallback\n")
+
+    engine = TesseractEngine(pool_size=1, acquire_timeout=0.05)
+    assert engine.recognize(_imagem(1)) == "persistente"
+
+    ocupada = engine._acquire_api() # Única API do pool em uso por outra instância
+    assert engine._acquire_api() is None
+    assert engine.recognize(_imagem(2)) == "fallback"
+    engine._apis.put(ocupada)
+    assert engine.recognize(_imagem(3)) == "persistente"
@@ -0,0 +1,48 @@
+import glob
+import cv2
+import numpy as np
+import pytest
+
+from actions.pyramid_matching import match_full, match_pyramid
+
+# Tolerância aceita entre o matching piramidal e o de resolução cheia
+TOLERANCIA_PX = 2
+TOLERANCIA_CONFIANCA = 0.02
+
+def test_pyramid_concorda_com_resolucao_cheia(tela_base):
+    print("\n=== TESTE DE TOLERÂNCIA: MATCHING PIRAMIDAL x RESOLUÇÃO CHEIA ===")
+    rng = np.random.default_rng(42)
+    base = cv2.cvtColor(tela_base, cv2.COLOR_BGR2GRAY)
+    testados = 0
+
+    for path in sorted(glob.glob("assets/buttons/**/*.*", recursive=True)):
+        template = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if template is None:
+            continue
+        h, w = template.shape
+        if h >= base.shape[0] or w >= base.shape[1]:
+            continue # Prints de tela inteira não cabem num frame 1280x720
+
+        # Cola o botão numa posição aleatória da tela, como aconteceria no jogo
+        tela = base.copy()
+        x = int(rng.integers(0, base.shape[1] - w))
+        y = int(rng.integers(0, base.shape[0] - h))
+        tela[y:y + h, x:x + w] = template
+
+        val_full, loc_full = match_full(tela, template)
+        val_pyr, loc_pyr = match_pyramid(tela, template)
+
+        centro_full = (loc_full[0] + w // 2, loc_full[1] + h // 2)
+        centro_pyr = (loc_pyr[0] + w // 2, loc_pyr[1] + h // 2)
+        print(f"{path}: full={centro_full} ({val_full:.3f}) | pyramid={centro_pyr} ({val_pyr:.3f})")
+
+        assert abs(centro_full[0] - centro_pyr[0]) <= TOLERANCIA_PX, path
+        assert abs(centro_full[1] - centro_pyr[1]) <= TOLERANCIA_PX, path
+        assert abs(val_full - val_pyr) <= TOLERANCIA_CONFIANCA, path
+        testados += 1
+
+    assert testados > 0
+    print(f"[SUCESSO] {testados} assets com resultado equivalente.")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-s"])
@@ -0,0 +1,89 @@
+import time
+
+import cv2
+import numpy as np
+
+from actions.frame_analysis import frame_signature, frames_differ, frames_differ_locally
+from actions.wait_conditions import (
+    AllOf, AnyOf, Predicate, ScreenChanged, ScreenStable, Then, wait_until
+)
+
+class _VisaoFalsa:
+    """Substitui o ImageRecognition: devolve os frames de uma lista (o último se repete)."""
+
+    def __init__(self, frames, before_input=None):
+        self.frames = list(frames)
+        self.before_input = before_input
+
+    def capture_frame(self, use_cache=True):
+        return self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+
+    def input_reference(self):
+        return self.before_input, 0.0
+
+def test_combinadores_com_predicados():
+    print("\n=== TESTE DOS COMBINADORES DE CONDIÇÃO ===")
+    verdadeiro, falso = Predicate(lambda: "ok"), Predicate(lambda: False)
+
+    assert wait_until(falso | verdadeiro, timeout=0.1) == "ok"
+    assert wait_until(AnyOf(falso, falso), timeout=0.05, interval=0.01) is None
+    assert wait_until(verdadeiro & Predicate(lambda: 2), timeout=0.1) == ["ok", 2]
+    assert wait_until(AllOf(verdadeiro, falso), timeout=0.05, interval=0.01) is None
+
+def test_then_avalia_em_sequencia():
+    print("\n=== TESTE DO THEN (SEQUÊNCIA) ===")
+    chamadas = []
+    contador = iter(range(100))
+    primeira = Predicate(lambda: chamadas.append("a") or next(contador) >= 2)
+    segunda = Predicate(lambda: chamadas.append("b") or "fim")
+
+    assert wait_until(Then(primeira, segunda), timeout=1, interval=0.01) == "fim"
+    # A segunda só roda depois da primeira ser satisfeita
+    assert chamadas == ["a", "a", "a", "b"]
+
+def test_then_concluido_dentro_de_allof():
+    print("\n=== TESTE DO THEN REAVALIADO APÓS CONCLUÍDO ===")
+    contador = iter(range(100))
+    tardia = Predicate(lambda: next(contador) >= 3)
+    # O Then conclui na primeira checagem e é reavaliado até a outra condição passar
+    assert wait_until(AllOf(Then(Predicate(lambda: "feito")), tardia), timeout=1, interval=0.01) == ["feito", True]
+
+def test_wait_until_respeita_timeout():
+    print("\n=== TESTE DO TIMEOUT DO WAIT_UNTIL ===")
+    inicio = time.time()
+    assert wait_until(Predicate(lambda: False), timeout=0.3, interval=0.2) is None
+    assert time.time() - inicio < 0.45
+
+def test_mudanca_local_detecta_botao_pequeno(tela_base, com_botao):
+    print("\n=== TESTE DE MUDANÇA LOCAL X MÉDIA DO FRAME ===")
+    base = tela_base
+    sig_base, sig_botao = frame_signature(base), frame_signature(com_botao(base))
+
+    # Pela média do frame inteiro o botão passa despercebido; pela célula, não
+    assert not frames_differ(sig_base, sig_botao)
+    assert frames_differ_locally(sig_base, sig_botao)
+
+    rng = np.random.default_rng(0)
+    ruido = np.clip(base.astype(int) + rng.normal(0, 3, base.shape), 0, 255).astype(np.uint8)
+    assert not frames_differ_locally(sig_base, frame_signature(ruido))
+
+def test_screen_changed_com_dialogo_pequeno(tela_base, com_botao):
+    print("\n=== TESTE DO SCREENCHANGED ===")
+    base = tela_base
+    visao = _VisaoFalsa([base, base, com_botao(base)], before_input=base)
+    assert wait_until(ScreenChanged(visao), timeout=1, interval=0.01)
+
+    parada = _VisaoFalsa([base])
+    assert wait_until(ScreenChanged(parada), timeout=0.05, interval=0.01) is None
+
+def test_screen_stable(tela_base):
+    print("\n=== TESTE DO SCREENSTABLE ===")
+    base = tela_base
+    outra = cv2.flip(base, 1)
+    visao = _VisaoFalsa([outra, base, outra, base])
+    inicio = time.time()
+    assert wait_until(ScreenStable(visao, stable_for=0.1), timeout=2, interval=0.02)
+    assert time.time() - inicio >= 0.1
+
+    piscando = _VisaoFalsa([base, outra] * 200)
+    assert wait_until(ScreenStable(piscando, stable_for=0.1), timeout=0.3, interval=0.01) is None